@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""Inverted full-text index and query CLI over docs/**/*.md.
+
+The index maps each term to the docs, headings, and lines it appears on and is
+persisted as gzip-compressed JSON under .codex/docs-index/. `update` re-reads
+only files whose size, mtime, or content hash changed; `search` ranks docs with
+BM25; `hub` regenerates the file lists on the docs index/hub pages.
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import gzip
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+DOCS_ROOT = REPO_ROOT / "docs"
+INDEX_ROOT = REPO_ROOT / ".codex" / "docs-index"
+INDEX_PATH = INDEX_ROOT / "index.json.gz"
+
+INDEX_VERSION = 1
+
+TOKEN_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9_]*")
+HEADING_RE = re.compile(r"^#{1,6}\s+(.*?)\s*#*\s*$")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it of on or that the this to was were will with".split()
+)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Hub page -> (section heading whose bullet list is generated, file-name pattern).
+COMPLETE_INDEX_PAGE = "010_Docs_Features_Hub.md"
+INDEX_PAGE_RE = re.compile(r"^\d{3}_")
+HUB_PAGES = {
+    COMPLETE_INDEX_PAGE: ("## Complete Markdown Index", re.compile(r".")),
+    "020_Docs_Feature_Implementation_Plans_Index.md": (
+        "## File List",
+        re.compile(r"(^|_)plan(_|\.md$)", re.IGNORECASE),
+    ),
+    "030_Docs_Explorations_Index.md": (
+        "## File List",
+        re.compile(r"exploration|requirements_summary|architecture_review|assessment", re.IGNORECASE),
+    ),
+}
+
+
+def tokenize(text: str) -> list[str]:
+    return [
+        token
+        for token in (match.group(0).lower() for match in TOKEN_RE.finditer(text))
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def collect_doc_paths() -> list[str]:
+    return sorted(path.relative_to(REPO_ROOT).as_posix() for path in DOCS_ROOT.rglob("*.md") if path.is_file())
+
+
+class DocsIndex:
+    """In-memory form of the persisted index.
+
+    docs:     rel_path -> {size, mtime_ns, sha256, title, headings, length}
+    postings: term -> {rel_path: [[line, heading_index], ...]}
+    """
+
+    def __init__(self) -> None:
+        self.docs: dict[str, dict] = {}
+        self.postings: dict[str, dict[str, list[list[int]]]] = {}
+        self.encoded: dict[str, list] = {}
+        self.doc_paths: list[str] = []
+        self.dirty = False
+
+    @classmethod
+    def load(cls) -> DocsIndex:
+        index = cls()
+        try:
+            with gzip.open(INDEX_PATH, "rt", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            return index
+        if payload.get("version") != INDEX_VERSION:
+            return index
+
+        # On disk, docs are a list and postings refer to them by position with
+        # delta-encoded line numbers: term -> [[doc_id, [line_delta, heading, ...]], ...].
+        # Postings stay encoded until a term is actually looked up.
+        index.doc_paths = [doc["path"] for doc in payload["docs"]]
+        for doc in payload["docs"]:
+            index.docs[doc.pop("path")] = doc
+        index.encoded = payload["postings"]
+        return index
+
+    def term_postings(self, term: str) -> dict[str, list[list[int]]]:
+        if term not in self.postings and term in self.encoded:
+            per_doc: dict[str, list[list[int]]] = {}
+            for doc_id, hits in self.encoded.pop(term):
+                line = 0
+                entries = []
+                for offset in range(0, len(hits), 2):
+                    line += hits[offset]
+                    entries.append([line, hits[offset + 1]])
+                per_doc[self.doc_paths[doc_id]] = entries
+            self.postings[term] = per_doc
+        return self.postings.get(term, {})
+
+    def decode_all(self) -> None:
+        for term in list(self.encoded):
+            self.term_postings(term)
+
+    def terms(self) -> set[str]:
+        return set(self.postings) | set(self.encoded)
+
+    def save(self) -> None:
+        self.decode_all()
+        doc_paths = sorted(self.docs)
+        doc_ids = {rel_path: doc_id for doc_id, rel_path in enumerate(doc_paths)}
+        postings = {}
+        for term in sorted(self.postings):
+            flat = []
+            for rel_path, entries in sorted(self.postings[term].items(), key=lambda item: doc_ids[item[0]]):
+                hits: list[int] = []
+                previous = 0
+                for line, heading in entries:
+                    hits.extend((line - previous, heading))
+                    previous = line
+                flat.append([doc_ids[rel_path], hits])
+            postings[term] = flat
+
+        payload = {
+            "version": INDEX_VERSION,
+            "docs": [{"path": rel_path, **self.docs[rel_path]} for rel_path in doc_paths],
+            "postings": postings,
+        }
+        INDEX_ROOT.mkdir(parents=True, exist_ok=True)
+        tmp_path = INDEX_PATH.with_name(f"{INDEX_PATH.name}.tmp")
+        # json.dumps uses the C encoder; streaming json.dump into gzip does not.
+        encoded = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        tmp_path.write_bytes(gzip.compress(encoded, compresslevel=6, mtime=0))
+        os.replace(tmp_path, INDEX_PATH)
+        self.dirty = False
+
+    def remove_docs(self, rel_paths: set[str]) -> None:
+        if not rel_paths:
+            return
+        self.decode_all()
+        self.dirty = True
+        for rel_path in rel_paths:
+            self.docs.pop(rel_path, None)
+        for term in list(self.postings):
+            per_doc = self.postings[term]
+            for rel_path in rel_paths.intersection(per_doc):
+                del per_doc[rel_path]
+            if not per_doc:
+                del self.postings[term]
+
+    def add_doc(self, rel_path: str, st: os.stat_result, data: bytes) -> None:
+        text = data.decode("utf-8", errors="replace")
+        title = Path(rel_path).stem
+        headings = [""]
+        heading_index = 0
+        length = 0
+        terms: dict[str, list[list[int]]] = defaultdict(list)
+
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            heading_match = HEADING_RE.match(line)
+            if heading_match:
+                if line.startswith("# ") and len(headings) == 1:
+                    title = heading_match.group(1)
+                headings.append(heading_match.group(1))
+                heading_index = len(headings) - 1
+            seen: set[str] = set()
+            for token in tokenize(line):
+                length += 1
+                if token not in seen:
+                    seen.add(token)
+                    terms[token].append([line_number, heading_index])
+
+        self.decode_all()
+        self.dirty = True
+        for term, entries in terms.items():
+            self.postings.setdefault(term, {})[rel_path] = entries
+        self.docs[rel_path] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "title": title,
+            "headings": headings,
+            "length": length,
+        }
+
+    def update(self) -> tuple[int, int, int]:
+        """Re-index changed files. Returns (added_or_changed, removed, unchanged)."""
+        current = collect_doc_paths()
+        removed = set(self.docs) - set(current)
+        self.remove_docs(removed)
+
+        changed = 0
+        unchanged = 0
+        for rel_path in current:
+            abs_path = REPO_ROOT / rel_path
+            st = abs_path.stat()
+            known = self.docs.get(rel_path)
+            if known and (known["size"], known["mtime_ns"]) == (st.st_size, st.st_mtime_ns):
+                unchanged += 1
+                continue
+            data = abs_path.read_bytes()
+            if known and known["sha256"] == hashlib.sha256(data).hexdigest():
+                known["mtime_ns"] = st.st_mtime_ns
+                self.dirty = True
+                unchanged += 1
+                continue
+            self.remove_docs({rel_path})
+            self.add_doc(rel_path, st, data)
+            changed += 1
+        return changed, len(removed), unchanged
+
+    def expand_term(self, term: str) -> list[str]:
+        if term.endswith("*"):
+            prefix = term[:-1].lower()
+            return [candidate for candidate in self.terms() if candidate.startswith(prefix)] if prefix else []
+        return tokenize(term)
+
+    def search(self, query: str, limit: int) -> list[tuple[float, str, list[list[int]]]]:
+        doc_count = max(1, len(self.docs))
+        average_length = sum(doc["length"] for doc in self.docs.values()) / doc_count or 1.0
+        scores: dict[str, float] = defaultdict(float)
+        hits: dict[str, list[list[int]]] = defaultdict(list)
+        matched_terms: dict[str, int] = defaultdict(int)
+
+        for word in query.split():
+            word_docs: set[str] = set()
+            for term in self.expand_term(word):
+                per_doc = self.term_postings(term)
+                if not per_doc:
+                    continue
+                idf = math.log(1 + (doc_count - len(per_doc) + 0.5) / (len(per_doc) + 0.5))
+                for rel_path, entries in per_doc.items():
+                    tf = len(entries)
+                    length = self.docs[rel_path]["length"]
+                    norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                    scores[rel_path] += idf * tf * (BM25_K1 + 1) / norm
+                    hits[rel_path].extend(entries)
+                    word_docs.add(rel_path)
+            for rel_path in word_docs:
+                matched_terms[rel_path] += 1
+
+        # Docs that match every query word rank ahead of partial matches.
+        ranked = sorted(scores, key=lambda rel: (-matched_terms[rel], -scores[rel], rel))
+        results = []
+        for rel_path in ranked[:limit]:
+            unique_hits = sorted({(line, heading) for line, heading in hits[rel_path]})
+            results.append((scores[rel_path], rel_path, [list(hit) for hit in unique_hits]))
+        return results
+
+
+def open_index(refresh: bool = True) -> DocsIndex:
+    index = DocsIndex.load()
+    if refresh:
+        index.update()
+        if index.dirty:
+            index.save()
+    return index
+
+
+def cmd_build(args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+    index = DocsIndex() if args.rebuild else DocsIndex.load()
+    changed, removed, unchanged = index.update()
+    index.save()
+    elapsed = (time.perf_counter() - started) * 1000
+    print(
+        f"Indexed {len(index.docs)} docs, {len(index.terms())} terms "
+        f"(reindexed={changed}, removed={removed}, unchanged={unchanged}) in {elapsed:.0f} ms"
+    )
+    print(f"Index: {INDEX_PATH}")
+    return 0
+
+
+def cmd_search(args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+    index = open_index(refresh=not args.no_refresh)
+    results = index.search(" ".join(args.query), args.limit)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    if not results:
+        print(f"No matches ({elapsed:.1f} ms)")
+        return 1
+
+    for score, rel_path, hits in results:
+        doc = index.docs[rel_path]
+        print(f"{score:6.2f}  {rel_path}  ({doc['title']})")
+        lines = (REPO_ROOT / rel_path).read_text(encoding="utf-8", errors="replace").splitlines()
+        for line, heading in hits[: args.lines]:
+            text = lines[line - 1].strip() if line <= len(lines) else ""
+            section = doc["headings"][heading] or "-"
+            print(f"        {rel_path}:{line}  [{section}]  {text[:120]}")
+        if len(hits) > args.lines:
+            print(f"        ... {len(hits) - args.lines} more lines")
+    print(f"{len(results)} docs ({elapsed:.1f} ms)")
+    return 0
+
+
+def render_hub_section(page: str, pattern: re.Pattern[str], index: DocsIndex) -> list[str]:
+    # Links are relative to docs/, so subfolder docs (DesignSystem/Documentation/...) keep their path.
+    links = {Path(rel_path).relative_to("docs").as_posix() for rel_path in index.docs if pattern.search(Path(rel_path).name)}
+    if page == COMPLETE_INDEX_PAGE:
+        links.add(page)
+    else:
+        # Filtered lists hold content docs only; 0NN_ pages are indexes (070_..._Master_Plan_Index matches "plan").
+        links = {link for link in links if not INDEX_PAGE_RE.match(link)}
+    # Case-insensitive, like the hand-maintained lists, so ALL-CAPS names don't jump ahead.
+    return [f"- [{link}]({link})" for link in sorted(links, key=str.lower)]
+
+
+def regenerate_hub(page: str, index: DocsIndex) -> tuple[str, str]:
+    heading, pattern = HUB_PAGES[page]
+    path = DOCS_ROOT / page
+    original = path.read_text(encoding="utf-8")
+    lines = original.splitlines()
+
+    try:
+        start = lines.index(heading) + 1
+    except ValueError:
+        raise SystemExit(f"Section '{heading}' not found in {path}") from None
+    end = start
+    while end < len(lines) and not lines[end].startswith("## "):
+        end += 1
+
+    body = ["", *render_hub_section(page, pattern, index)]
+    if end < len(lines):
+        body.append("")
+    updated_lines = lines[:start] + body + lines[end:]
+
+    updated = "\n".join(updated_lines) + "\n"
+    if updated != original:
+        updated = re.sub(r"^Last Updated: .*$", f"Last Updated: {date.today().isoformat()}", updated, count=1, flags=re.M)
+    return original, updated
+
+
+def cmd_hub(args: argparse.Namespace) -> int:
+    index = open_index()
+    stale = 0
+    for page in args.pages or sorted(HUB_PAGES):
+        if page not in HUB_PAGES:
+            raise SystemExit(f"Unknown hub page: {page} (choose from {', '.join(sorted(HUB_PAGES))})")
+        original, updated = regenerate_hub(page, index)
+        if original == updated:
+            print(f"Up to date: docs/{page}")
+            continue
+        stale += 1
+        if args.write:
+            (DOCS_ROOT / page).write_text(updated, encoding="utf-8")
+            print(f"Regenerated: docs/{page}")
+        else:
+            sys.stdout.writelines(
+                difflib.unified_diff(
+                    original.splitlines(keepends=True),
+                    updated.splitlines(keepends=True),
+                    fromfile=f"docs/{page}",
+                    tofile=f"docs/{page} (generated)",
+                )
+            )
+    return 1 if stale and not args.write else 0
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Full-text index and search over docs/.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Create or incrementally update the index.")
+    build.add_argument("--rebuild", action="store_true", help="Discard the existing index first.")
+    build.set_defaults(handler=cmd_build)
+
+    search = commands.add_parser("search", help="Ranked search; `term*` matches a prefix.")
+    search.add_argument("query", nargs="+")
+    search.add_argument("--limit", type=int, default=10, help="Maximum docs to show.")
+    search.add_argument("--lines", type=int, default=3, help="Matching lines to show per doc.")
+    search.add_argument("--no-refresh", action="store_true", help="Skip the incremental update before searching.")
+    search.set_defaults(handler=cmd_search)
+
+    hub = commands.add_parser("hub", help="Regenerate hub/index page file lists (diff by default).")
+    hub.add_argument("pages", nargs="*", help="Hub page file names; defaults to all.")
+    hub.add_argument("--write", action="store_true", help="Rewrite the pages instead of printing a diff.")
+    hub.set_defaults(handler=cmd_hub)
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
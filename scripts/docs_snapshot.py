@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""Content-addressed docs snapshot engine.
+
+Drop-in engine for scripts/docs_snapshot.sh (same create/list/verify/rollback
+commands, manifest.tsv and metadata.tsv formats). File contents are stored
+once per SHA-256 under .codex/docs-snapshots/blobs/, so a snapshot of an
+unchanged tree only costs a new manifest. Hashing runs on a thread pool and a
+stat cache (size, mtime, inode) skips rehashing files that have not changed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import os
+import re
+import sys
+import tarfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+SNAPSHOT_ROOT = REPO_ROOT / ".codex" / "docs-snapshots"
+BLOB_ROOT = SNAPSHOT_ROOT / "blobs"
+STAT_CACHE_PATH = SNAPSHOT_ROOT / "stat-cache.tsv"
+
+# A file modified within this window of its stat being taken may change again
+# without moving mtime, so its cached hash is not trusted.
+RACY_WINDOW_NS = 2_000_000_000
+
+HASH_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+
+
+class SnapshotError(Exception):
+    pass
+
+
+class ManifestEntry:
+    __slots__ = ("sha256", "size", "mode", "rel_path")
+
+    def __init__(self, sha256: str, size: int, mode: str, rel_path: str) -> None:
+        self.sha256 = sha256
+        self.size = size
+        self.mode = mode
+        self.rel_path = rel_path
+
+    def to_line(self) -> str:
+        return f"{self.sha256}\t{self.size}\t{self.mode}\t{self.rel_path}\n"
+
+
+def log(message: str) -> None:
+    print(message, flush=True)
+
+
+def sanitize_label(label: str) -> str:
+    slug = re.sub(r"[^a-z0-9._-]+", "-", label.lower())
+    return re.sub(r"-+", "-", slug)
+
+
+def metadata_read(metadata_file: Path) -> dict[str, str]:
+    values: dict[str, str] = {}
+    for line in metadata_file.read_text(encoding="utf-8").splitlines():
+        key, _, value = line.partition("\t")
+        values.setdefault(key, value)
+    return values
+
+
+def collect_scope_paths() -> list[str]:
+    docs_root = REPO_ROOT / "docs"
+    paths = []
+    for path in docs_root.rglob("*.md"):
+        if path.is_file() and SNAPSHOT_ROOT not in path.parents:
+            paths.append(path.relative_to(REPO_ROOT).as_posix())
+    return sorted(paths, key=lambda rel: rel.encode("utf-8"))
+
+
+def file_mode(st: os.stat_result) -> str:
+    # Matches `stat -f '%Mp%Lp'` from the shell engine, e.g. 0644.
+    return f"{st.st_mode & 0o7777:04o}"
+
+
+def blob_path(sha256: str) -> Path:
+    return BLOB_ROOT / sha256[:2] / f"{sha256}.gz"
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class StatCache:
+    """rel_path -> (size, mtime_ns, inode, sha256), persisted as TSV."""
+
+    def __init__(self) -> None:
+        self.entries: dict[str, tuple[int, int, int, str]] = {}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls) -> StatCache:
+        cache = cls()
+        try:
+            lines = STAT_CACHE_PATH.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return cache
+        for line in lines:
+            parts = line.split("\t")
+            if len(parts) != 5:
+                continue
+            rel_path, size, mtime_ns, inode, sha256 = parts
+            cache.entries[rel_path] = (int(size), int(mtime_ns), int(inode), sha256)
+        return cache
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        SNAPSHOT_ROOT.mkdir(parents=True, exist_ok=True)
+        tmp_path = STAT_CACHE_PATH.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            for rel_path in sorted(self.entries):
+                size, mtime_ns, inode, sha256 = self.entries[rel_path]
+                handle.write(f"{rel_path}\t{size}\t{mtime_ns}\t{inode}\t{sha256}\n")
+        os.replace(tmp_path, STAT_CACHE_PATH)
+        self.dirty = False
+
+    def lookup(self, rel_path: str, st: os.stat_result, now_ns: int) -> str | None:
+        cached = self.entries.get(rel_path)
+        if cached is None or cached[:3] != (st.st_size, st.st_mtime_ns, st.st_ino):
+            return None
+        if now_ns - st.st_mtime_ns < RACY_WINDOW_NS:
+            return None
+        return cached[3]
+
+    def store(self, rel_path: str, st: os.stat_result, sha256: str) -> None:
+        self.entries[rel_path] = (st.st_size, st.st_mtime_ns, st.st_ino, sha256)
+        self.dirty = True
+
+
+def hash_paths(rel_paths: list[str], cache: StatCache) -> dict[str, ManifestEntry]:
+    """Stat every path, hash only stat-cache misses (in parallel)."""
+    now_ns = time.time_ns()
+    entries: dict[str, ManifestEntry] = {}
+    stats: dict[str, os.stat_result] = {}
+    to_hash: list[str] = []
+
+    for rel_path in rel_paths:
+        abs_path = REPO_ROOT / rel_path
+        try:
+            st = abs_path.stat()
+        except FileNotFoundError:
+            continue
+        stats[rel_path] = st
+        cached = cache.lookup(rel_path, st, now_ns)
+        if cached is not None:
+            cache.hits += 1
+            entries[rel_path] = ManifestEntry(cached, st.st_size, file_mode(st), rel_path)
+        else:
+            cache.misses += 1
+            to_hash.append(rel_path)
+
+    if to_hash:
+        with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+            digests = pool.map(lambda rel: sha256_file(REPO_ROOT / rel), to_hash)
+            for rel_path, sha256 in zip(to_hash, digests):
+                st = stats[rel_path]
+                cache.store(rel_path, st, sha256)
+                entries[rel_path] = ManifestEntry(sha256, st.st_size, file_mode(st), rel_path)
+
+    return entries
+
+
+def store_blob(entry: ManifestEntry) -> bool:
+    """Write the blob for `entry` unless it already exists. Returns True if written."""
+    target = blob_path(entry.sha256)
+    if target.exists():
+        return False
+    data = (REPO_ROOT / entry.rel_path).read_bytes()
+    if hashlib.sha256(data).hexdigest() != entry.sha256:
+        raise SnapshotError(f"File changed while creating snapshot: {entry.rel_path}")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    with gzip.GzipFile(tmp_path, "wb", mtime=0) as handle:
+        handle.write(data)
+    os.replace(tmp_path, target)
+    return True
+
+
+def read_manifest(manifest_file: Path) -> list[ManifestEntry]:
+    entries = []
+    for line in manifest_file.read_text(encoding="utf-8").splitlines():
+        parts = line.split("\t")
+        if len(parts) != 4 or not parts[3]:
+            continue
+        entries.append(ManifestEntry(parts[0], int(parts[1]), parts[2], parts[3]))
+    return entries
+
+
+def create_snapshot_id(label: str) -> str:
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    slug = sanitize_label(label) or "snapshot"
+    candidate = f"{timestamp}-{slug}"
+    suffix = 1
+    while (SNAPSHOT_ROOT / candidate).exists():
+        candidate = f"{timestamp}-{slug}-{suffix}"
+        suffix += 1
+    return candidate
+
+
+def create_snapshot_internal(label: str, baseline: bool, set_latest: bool, purpose: str) -> str:
+    SNAPSHOT_ROOT.mkdir(parents=True, exist_ok=True)
+
+    rel_paths = collect_scope_paths()
+    if not rel_paths:
+        raise SnapshotError("No markdown files found in snapshot scope")
+
+    cache = StatCache.load()
+    hashed = hash_paths(rel_paths, cache)
+    missing = [rel for rel in rel_paths if rel not in hashed]
+    if missing:
+        raise SnapshotError(f"Path missing while creating manifest: {missing[0]}")
+    entries = [hashed[rel] for rel in rel_paths]
+
+    unique = {entry.sha256: entry for entry in entries}
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+        new_blobs = sum(pool.map(store_blob, unique.values()))
+    cache.save()
+
+    snapshot_id = create_snapshot_id(label)
+    snapshot_dir = SNAPSHOT_ROOT / snapshot_id
+    snapshot_dir.mkdir(parents=True)
+
+    (snapshot_dir / "paths.txt").write_text("".join(f"{rel}\n" for rel in rel_paths), encoding="utf-8")
+    manifest_file = snapshot_dir / "manifest.tsv"
+    manifest_file.write_text("".join(entry.to_line() for entry in entries), encoding="utf-8")
+
+    created_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    metadata = [
+        ("id", snapshot_id),
+        ("created_at", created_at),
+        ("label", label),
+        ("purpose", purpose),
+        ("baseline", "true" if baseline else "false"),
+        ("file_count", str(len(entries))),
+        ("manifest_sha256", sha256_file(manifest_file)),
+        ("storage", "blobs"),
+        ("new_blobs", str(new_blobs)),
+        ("repo_root", str(REPO_ROOT)),
+        ("scope", "docs/*.md excluding .codex/docs-snapshots"),
+    ]
+    (snapshot_dir / "metadata.tsv").write_text(
+        "".join(f"{key}\t{value}\n" for key, value in metadata), encoding="utf-8"
+    )
+
+    if baseline:
+        (SNAPSHOT_ROOT / "baseline").write_text(f"{snapshot_id}\n", encoding="utf-8")
+    if set_latest:
+        (SNAPSHOT_ROOT / "latest").write_text(f"{snapshot_id}\n", encoding="utf-8")
+
+    return snapshot_id
+
+
+def resolve_snapshot_id(ref: str) -> str:
+    if ref in ("latest", ""):
+        pointer = SNAPSHOT_ROOT / "latest"
+        if not pointer.is_file():
+            raise SnapshotError("No latest snapshot pointer found")
+        ref = pointer.read_text(encoding="utf-8").strip()
+    elif ref == "baseline":
+        pointer = SNAPSHOT_ROOT / "baseline"
+        if not pointer.is_file():
+            raise SnapshotError("No baseline snapshot pointer found")
+        ref = pointer.read_text(encoding="utf-8").strip()
+
+    if not ref or not (SNAPSHOT_ROOT / ref).is_dir():
+        raise SnapshotError(f"Snapshot not found: {ref}")
+    return ref
+
+
+def read_pointer(name: str) -> str:
+    pointer = SNAPSHOT_ROOT / name
+    return pointer.read_text(encoding="utf-8").strip() if pointer.is_file() else ""
+
+
+def list_snapshots() -> None:
+    SNAPSHOT_ROOT.mkdir(parents=True, exist_ok=True)
+    metadata_files = sorted(SNAPSHOT_ROOT.glob("*/metadata.tsv"), key=lambda path: str(path).encode("utf-8"))
+    if not metadata_files:
+        log(f"No docs snapshots found in {SNAPSHOT_ROOT}")
+        return
+
+    baseline_id = read_pointer("baseline")
+    latest_id = read_pointer("latest")
+
+    log("ID | Created At (UTC) | Label | Purpose | Flags")
+    for metadata_file in metadata_files:
+        metadata = metadata_read(metadata_file)
+        snapshot_id = metadata.get("id", "")
+        flags = []
+        if snapshot_id == latest_id:
+            flags.append("latest")
+        if snapshot_id == baseline_id:
+            flags.append("baseline")
+        log(
+            f"{snapshot_id} | {metadata.get('created_at', '')} | {metadata.get('label', '')} | "
+            f"{metadata.get('purpose', '')} | {' '.join(flags)}"
+        )
+
+
+def verify_snapshot_by_id(snapshot_id: str) -> None:
+    manifest_file = SNAPSHOT_ROOT / snapshot_id / "manifest.tsv"
+    if not manifest_file.is_file():
+        raise SnapshotError(f"Manifest missing for snapshot: {snapshot_id}")
+
+    expected = read_manifest(manifest_file)
+    current_paths = collect_scope_paths()
+    manifest_paths = {entry.rel_path for entry in expected}
+    current_set = set(current_paths)
+
+    missing = sorted(manifest_paths - current_set)
+    extras = sorted(current_set - manifest_paths)
+
+    if missing:
+        log(f"Missing files compared to snapshot {snapshot_id}:")
+        for rel_path in missing[:20]:
+            log(rel_path)
+
+    if extras:
+        log(f"Extra in-scope files not in snapshot {snapshot_id}:")
+        for rel_path in extras[:20]:
+            log(rel_path)
+
+    cache = StatCache.load()
+    actual = hash_paths([entry.rel_path for entry in expected], cache)
+    cache.save()
+
+    mismatch_count = 0
+    for entry in expected:
+        current = actual.get(entry.rel_path)
+        if current is None:
+            mismatch_count += 1
+            continue
+        if (current.sha256, current.size, current.mode) != (entry.sha256, entry.size, entry.mode):
+            mismatch_count += 1
+            log(f"Mismatch: {entry.rel_path}")
+
+    if missing or extras or mismatch_count:
+        raise SnapshotError(
+            f"Verification failed for snapshot {snapshot_id} "
+            f"(missing={len(missing)}, extras={len(extras)}, mismatches={mismatch_count})"
+        )
+
+    log(
+        f"Verification passed for snapshot {snapshot_id}: exact file set, hashes, sizes, and modes match. "
+        f"(rehashed {cache.misses} of {cache.hits + cache.misses} files)"
+    )
+
+
+def restore_entry(entry: ManifestEntry) -> None:
+    source = blob_path(entry.sha256)
+    if not source.is_file():
+        raise SnapshotError(f"Blob missing for {entry.rel_path}: {entry.sha256}")
+    target = REPO_ROOT / entry.rel_path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(source, "rb") as handle:
+        target.write_bytes(handle.read())
+
+
+def rollback_to_snapshot(ref: str) -> None:
+    SNAPSHOT_ROOT.mkdir(parents=True, exist_ok=True)
+    snapshot_id = resolve_snapshot_id(ref)
+    snapshot_dir = SNAPSHOT_ROOT / snapshot_id
+    manifest_file = snapshot_dir / "manifest.tsv"
+    archive_file = snapshot_dir / "docs.tar.gz"
+    uses_blobs = metadata_read(snapshot_dir / "metadata.tsv").get("storage") == "blobs"
+
+    if not manifest_file.is_file():
+        raise SnapshotError(f"Manifest missing for snapshot: {snapshot_id}")
+    if not uses_blobs and not archive_file.is_file():
+        raise SnapshotError(f"Archive missing for snapshot: {snapshot_id}")
+
+    safety_id = create_snapshot_internal(f"pre-rollback-{snapshot_id}", False, False, "pre-rollback")
+    log(f"Safety snapshot created: {safety_id}")
+
+    entries = read_manifest(manifest_file)
+    target_paths = {entry.rel_path for entry in entries}
+    for rel_path in collect_scope_paths():
+        if rel_path not in target_paths:
+            (REPO_ROOT / rel_path).unlink(missing_ok=True)
+
+    if uses_blobs:
+        with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+            list(pool.map(restore_entry, entries))
+    else:
+        # Snapshots taken by the shell engine carry a tarball instead of blobs.
+        with tarfile.open(archive_file, "r:gz") as archive:
+            if hasattr(tarfile, "data_filter"):
+                archive.extractall(REPO_ROOT, filter="data")
+            else:
+                archive.extractall(REPO_ROOT)
+
+    for entry in entries:
+        os.chmod(REPO_ROOT / entry.rel_path, int(entry.mode, 8))
+
+    verify_snapshot_by_id(snapshot_id)
+    log(f"Rollback complete. Restored docs to snapshot {snapshot_id}.")
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="scripts/docs_snapshot.sh",
+        description="Snapshot, verify, and roll back docs/**/*.md.",
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    create = commands.add_parser("create", help="Create a snapshot of the docs tree.")
+    create.add_argument("--label", default="manual")
+    create.add_argument("--baseline", action="store_true")
+
+    commands.add_parser("list", help="List snapshots.")
+
+    verify = commands.add_parser("verify", help="Verify docs against a snapshot.")
+    verify.add_argument("ref", nargs="?", default="latest", metavar="snapshot-id|latest|baseline")
+
+    rollback = commands.add_parser("rollback", help="Restore docs to a snapshot.")
+    rollback.add_argument("ref", nargs="?", default="baseline", metavar="snapshot-id|latest|baseline")
+
+    # The shell engine accepted `help` as a command; main() prints usage for it.
+    commands.add_parser("help", help="Show this help.")
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    try:
+        if args.command == "create":
+            snapshot_id = create_snapshot_internal(args.label, args.baseline, True, "manual")
+            log(f"Snapshot created: {snapshot_id}")
+            if args.baseline:
+                log(f"Baseline pointer updated to: {snapshot_id}")
+        elif args.command == "list":
+            list_snapshots()
+        elif args.command == "verify":
+            SNAPSHOT_ROOT.mkdir(parents=True, exist_ok=True)
+            verify_snapshot_by_id(resolve_snapshot_id(args.ref))
+        elif args.command == "rollback":
+            rollback_to_snapshot(args.ref)
+        else:
+            parse_args(["--help"])
+    except SnapshotError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,6 +4,14 @@ set -euo pipefail
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 REPO_ROOT="$(cd "${SCRIPT_DIR}/.." && pwd)"
 SNAPSHOT_ROOT="${REPO_ROOT}/.codex/docs-snapshots"
+PYTHON_ENGINE="${SCRIPT_DIR}/docs_snapshot.py"
+
+# The Python engine stores content-addressed blobs and hashes in parallel.
+# Set DOCS_SNAPSHOT_ENGINE=shell to force the original tarball implementation;
+# it can list and verify blob snapshots but only roll back tarball ones.
+if [[ "${DOCS_SNAPSHOT_ENGINE:-python}" == "python" && -f "${PYTHON_ENGINE}" ]] && command -v python3 >/dev/null 2>&1; then
+  exec python3 "${PYTHON_ENGINE}" "$@"
+fi
 
 usage() {
   cat <<'USAGE'
@@ -280,6 +288,9 @@ rollback_to_snapshot() {
   archive_file="${snapshot_dir}/docs.tar.gz"
   manifest_file="${snapshot_dir}/manifest.tsv"
 
+  if [[ "$(metadata_get "${snapshot_dir}/metadata.tsv" storage)" == "blobs" ]]; then
+    die "Snapshot ${id} uses blob storage; the shell engine can only roll back docs.tar.gz snapshots. Run without DOCS_SNAPSHOT_ENGINE=shell."
+  fi
   [[ -f "${archive_file}" ]] || die "Archive missing for snapshot: ${id}"
   [[ -f "${manifest_file}" ]] || die "Manifest missing for snapshot: ${id}"
 
@@ -10,6 +10,9 @@ TEST_METHOD_NAME="testGestureDemoVideo"
 PROJECT_PATH="ios-swift/Notelayer/Notelayer.xcodeproj"
 VIDEO_DIR="/Users/bens/Notelayer/App-Icons-&-screenshots"
 VIDEO_PATH="$VIDEO_DIR/gesture-demo.mp4"
+FRAMED_VIDEO_PATH="$VIDEO_DIR/gesture-demo-framed.mp4"
+FRAME_RENDER_SCRIPT="$(cd "$(dirname "$0")" && pwd)/render-iphone-framed-screenshots.py"
+FRAME_VIDEO="${GESTURE_DEMO_FRAME_VIDEO:-true}"
 
 echo "🎬 Starting gesture demo video capture"
 
@@ -91,3 +94,15 @@ if [ $TEST_STATUS -ne 0 ]; then
 fi
 
 echo "✅ Gesture demo video saved to: $VIDEO_PATH"
+
+if [ "$FRAME_VIDEO" = "true" ]; then
+    if command -v ffmpeg >/dev/null 2>&1 && command -v ffprobe >/dev/null 2>&1; then
+        echo "📱 Framing gesture demo in iPhone hardware frame..."
+        python3 "$FRAME_RENDER_SCRIPT" \
+            --video-input "$VIDEO_PATH" \
+            --video-output "$FRAMED_VIDEO_PATH"
+        echo "✅ Framed gesture demo saved to: $FRAMED_VIDEO_PATH"
+    else
+        echo "⚠️  ffmpeg/ffprobe not found; skipping framed video. Install with: brew install ffmpeg"
+    fi
+fi
@@ -17,6 +17,10 @@ SCHEME_NAME="Screenshot Generation"
 TEST_TARGET_NAME="NotelayerScreenshotTests"
 SCHEME_PATH="$PROJECT_PATH/xcshareddata/xcschemes/$SCHEME_NAME.xcscheme"
 MARKETING_RENDER_SCRIPT="$ROOT_DIR/scripts/render-marketing-screenshots.py"
+# Thin client: uses a warm `render-server.py serve` if one is running, else renders in-process.
+RENDER_CLIENT="$ROOT_DIR/scripts/render-server.py"
+ASSET_VALIDATOR="$ROOT_DIR/scripts/validate-app-store-assets.py"
+RUN_REPORT_SCRIPT="$ROOT_DIR/scripts/run_report.py"
 
 ASSET_ROOT_DEFAULT="$HOME/Downloads/Documents from Macbook Air 2026/App-Icons-&-screenshots"
 ASSET_ROOT="${SCREENSHOT_ASSET_ROOT:-$ASSET_ROOT_DEFAULT}"
@@ -24,10 +28,14 @@ OUTPUT_ROOT="$ASSET_ROOT/Screenshots for App Store/Generated"
 STANDARD_RAW_ROOT="$OUTPUT_ROOT/standard/raw"
 MARKETING_RAW_ROOT="$OUTPUT_ROOT/marketing/raw"
 MARKETING_COMPOSED_ROOT="$OUTPUT_ROOT/marketing/composed"
+# One JSON report per Python stage; merged into summary.json at the end of the run.
+REPORT_ROOT="$OUTPUT_ROOT/reports"
+RUN_REPORT_DIR="$REPORT_ROOT/$(date +%Y%m%d-%H%M%S)"
 TEMP_ROOT="$ROOT_DIR/ios-swift/Notelayer/Screenshots"
 
 TARGETS="${SCREENSHOT_DEVICE_TARGETS:-iphone,ipad}"
 GENERATE_MARKETING="${SCREENSHOT_GENERATE_MARKETING:-true}"
+GENERATE_PANORAMA="${SCREENSHOT_GENERATE_PANORAMA:-false}"
 
 SCREENSHOT_METHODS=(
   "testScreenshot1_TodosListView"
@@ -156,16 +164,25 @@ run_for_device() {
     mkdir -p "$export_dir"
     xcrun xcresulttool export attachments --path "$latest_xcresult" --output-path "$export_dir" >/dev/null 2>&1 || true
 
-    python3 - "$export_dir" "$raw_dir" "$device_key" <<'PY'
+    PYTHONPATH="$ROOT_DIR/scripts${PYTHONPATH:+:$PYTHONPATH}" \
+    python3 - "$export_dir" "$raw_dir" "$device_key" "$RUN_REPORT_DIR/export-$device_key.json" <<'PY'
+import atexit
 import json
 import os
 import re
 import shutil
 import sys
+import time
+
+from run_report import RunReport
+
+export_dir, raw_dir, device_key, report_path = sys.argv[1:5]
+report = RunReport(f"export-{device_key}")
+atexit.register(report.write, report_path)
 
-export_dir, raw_dir, device_key = sys.argv[1:4]
 manifest_path = os.path.join(export_dir, "manifest.json")
 if not os.path.exists(manifest_path):
+    report.add_failure(manifest_path, "no exported attachments manifest")
     raise SystemExit(0)
 
 with open(manifest_path, "r", encoding="utf-8") as manifest_file:
@@ -188,7 +205,10 @@ for test_entry in manifest:
 
         screenshot_stem = match.group(1)
         destination_path = os.path.join(raw_dir, f"{device_key}-{screenshot_stem}.png")
+        started = time.perf_counter()
         shutil.copyfile(source_path, destination_path)
+        size = os.path.getsize(destination_path)
+        report.add_file(destination_path, "copy", time.perf_counter() - started, size, size)
 PY
   fi
 
@@ -217,6 +237,8 @@ if [ "$GENERATE_MARKETING" = "true" ]; then
 fi
 
 overall_status=0
+render_status=0
+validation_status=0
 IFS=',' read -r -a requested_targets <<< "$TARGETS"
 for target in "${requested_targets[@]}"; do
   case "${target// /}" in
@@ -235,9 +257,32 @@ done
 if [ "$GENERATE_MARKETING" = "true" ]; then
   echo ""
   echo -e "${YELLOW}🎨 Rendering marketing-oriented composites...${NC}"
-  python3 "$MARKETING_RENDER_SCRIPT" \
+  python3 "$RENDER_CLIENT" marketing \
     --source-root "$MARKETING_RAW_ROOT" \
-    --output-root "$MARKETING_COMPOSED_ROOT"
+    --output-root "$MARKETING_COMPOSED_ROOT" \
+    --report "$RUN_REPORT_DIR/marketing.json" || render_status=1
+
+  if [ "$GENERATE_PANORAMA" = "true" ]; then
+    echo ""
+    echo -e "${YELLOW}🌄 Rendering panoramic marketing strip...${NC}"
+    python3 "$RENDER_CLIENT" marketing \
+      --source-root "$MARKETING_RAW_ROOT" \
+      --output-root "$MARKETING_COMPOSED_ROOT" \
+      --panorama \
+      --report "$RUN_REPORT_DIR/marketing-panorama.json" || render_status=1
+  fi
+
+  echo ""
+  echo -e "${YELLOW}🔎 Validating composites against App Store screenshot rules...${NC}"
+  python3 "$ASSET_VALIDATOR" --failures-only "$MARKETING_COMPOSED_ROOT" || validation_status=1
+fi
+
+if [ -d "$RUN_REPORT_DIR" ]; then
+  echo ""
+  echo -e "${YELLOW}📊 Run report${NC}"
+  python3 "$RUN_REPORT_SCRIPT" summarize "$RUN_REPORT_DIR" \
+    --output "$RUN_REPORT_DIR/summary.json" \
+    --history "$REPORT_ROOT/history.jsonl" || true
 fi
 
 echo ""
@@ -246,9 +291,20 @@ if [ "$GENERATE_MARKETING" = "true" ]; then
   echo -e "${GREEN}📁 Marketing raw set:${NC} $MARKETING_RAW_ROOT"
   echo -e "${GREEN}📁 Marketing composed set:${NC} $MARKETING_COMPOSED_ROOT"
 fi
+if [ -f "$RUN_REPORT_DIR/summary.json" ]; then
+  echo -e "${GREEN}📁 Run report:${NC} $RUN_REPORT_DIR/summary.json"
+fi
 
 if [ "$overall_status" -ne 0 ]; then
   echo -e "${YELLOW}⚠️  Completed with some test failures. Check /tmp/screenshot-build-*.log${NC}"
+fi
+if [ "$render_status" -ne 0 ]; then
+  echo -e "${YELLOW}⚠️  Marketing composite rendering failed. See the renderer output above and $RUN_REPORT_DIR.${NC}"
+fi
+if [ "$validation_status" -ne 0 ]; then
+  echo -e "${YELLOW}⚠️  Marketing composites failed App Store validation. See the validator output above.${NC}"
+fi
+if [ "$overall_status" -ne 0 ] || [ "$render_status" -ne 0 ] || [ "$validation_status" -ne 0 ]; then
   exit 1
 fi
 
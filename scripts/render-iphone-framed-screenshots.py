@@ -3,17 +3,46 @@
 from __future__ import annotations
 
 import argparse
+import json
+import os
 import re
+import subprocess
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple
 
 from PIL import Image, ImageDraw, ImageFilter
+from render_masks import clip_to_mask, rounded_mask
+from render_pipeline import Stage, run_pipeline
+from run_report import RunReport
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Render realistic iPhone-framed screenshots.")
-    parser.add_argument("--source-dir", required=True, help="Directory containing iPhone PNG screenshots.")
-    parser.add_argument("--output-dir", required=True, help="Directory for framed PNG screenshots.")
-    return parser.parse_args()
+    parser.add_argument("--source-dir", help="Directory containing iPhone PNG screenshots.")
+    parser.add_argument("--output-dir", help="Directory for framed PNG screenshots.")
+    parser.add_argument(
+        "--sequence",
+        action="store_true",
+        help="Treat --source-dir as numbered video frames and stream them through worker threads.",
+    )
+    parser.add_argument("--video-input", help="Video file to frame (decoded through an ffmpeg pipe).")
+    parser.add_argument("--video-output", help="Framed video file (encoded through an ffmpeg pipe).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Framing worker threads.")
+    parser.add_argument("--io-workers", type=int, default=2, help="Decode and encode threads for still screenshots.")
+    parser.add_argument("--queue-size", type=int, default=0, help="Frames in flight (default: 2x workers).")
+    parser.add_argument("--report", help="Write a JSON run report (timings, bytes, caches, peak RSS) here.")
+    args = parser.parse_args()
+
+    if args.video_input or args.video_output:
+        if not (args.video_input and args.video_output):
+            parser.error("--video-input and --video-output must be used together")
+    elif not (args.source_dir and args.output_dir):
+        parser.error("--source-dir and --output-dir are required (or --video-input/--video-output)")
+    return args
 
 
 def lerp_color(a: tuple[int, int, int], b: tuple[int, int, int], t: float) -> tuple[int, int, int]:
@@ -36,22 +65,24 @@ def draw_horizontal_gradient(image: Image.Image, left: tuple[int, int, int], rig
         draw.line([(x, 0), (x, height)], fill=lerp_color(left, right, t))
 
 
-def rounded_mask(size: tuple[int, int], radius: int) -> Image.Image:
-    mask = Image.new("L", size, 0)
-    ImageDraw.Draw(mask).rounded_rectangle([(0, 0), (size[0], size[1])], radius=radius, fill=255)
-    return mask
-
-
 def natural_sort_key(path: Path) -> tuple[int, str]:
     match = re.search(r"screenshot-(\d+)-", path.name)
     number = int(match.group(1)) if match else 999
     return (number, path.name)
 
 
-def frame_iphone_screenshot(source: Image.Image) -> Image.Image:
-    screen = source.convert("RGBA")
-    sw, sh = screen.size
+class FrameTemplate(NamedTuple):
+    """Everything in a framed shot that does not depend on screen content."""
+
+    background: Image.Image  # Finished RGB frame with an empty screen.
+    screen_box: tuple[int, int, int, int]
+    under: Image.Image  # RGBA layers below the glass, cropped to screen_box.
+    over: Image.Image  # RGBA layers above the glass, cropped to screen_box.
+    glass_mask: Image.Image
+
 
+@lru_cache(maxsize=4)
+def build_frame_template(sw: int, sh: int) -> FrameTemplate:
     bezel = max(44, int(sw * 0.055))
     shell = max(10, int(sw * 0.010))
     phone_w = sw + (bezel + shell) * 2
@@ -86,11 +117,9 @@ def frame_iphone_screenshot(source: Image.Image) -> Image.Image:
     canvas_rgba = Image.alpha_composite(canvas_rgba, shadow)
 
     # Phone body with metallic side-tone.
-    body = Image.new("RGBA", (phone_w, phone_h), (0, 0, 0, 0))
     body_base = Image.new("RGB", (phone_w, phone_h), (34, 35, 39))
     draw_horizontal_gradient(body_base, (46, 48, 53), (22, 23, 26))
-    body_mask = rounded_mask((phone_w, phone_h), radius=int(phone_w * 0.14))
-    body.paste(body_base.convert("RGBA"), (0, 0), body_mask)
+    body = clip_to_mask(body_base.convert("RGBA"), rounded_mask((phone_w, phone_h), radius=int(phone_w * 0.14)))
 
     body_overlay = ImageDraw.Draw(body)
     body_overlay.rounded_rectangle(
@@ -127,9 +156,8 @@ def frame_iphone_screenshot(source: Image.Image) -> Image.Image:
     canvas_rgba = Image.alpha_composite(canvas_rgba, cavity)
 
     glass_mask = rounded_mask((sw, sh), radius=screen_radius)
-    glass_layer = Image.new("RGBA", (cw, ch), (0, 0, 0, 0))
-    glass_layer.paste(screen, (screen_left, screen_top), glass_mask)
-    canvas_rgba = Image.alpha_composite(canvas_rgba, glass_layer)
+    under_glass = canvas_rgba
+    canvas_rgba = Image.new("RGBA", (cw, ch), (0, 0, 0, 0))
 
     # Dynamic island and lens details.
     island_w = int(sw * 0.26)
@@ -184,29 +212,272 @@ def frame_iphone_screenshot(source: Image.Image) -> Image.Image:
     )
     canvas_rgba = Image.alpha_composite(canvas_rgba, highlight)
 
-    return canvas_rgba.convert("RGB")
+    # Only the screen rectangle changes per shot; everything else is baked.
+    screen_box = (screen_left, screen_top, screen_right, screen_bottom)
+    return FrameTemplate(
+        background=Image.alpha_composite(under_glass, canvas_rgba).convert("RGB"),
+        screen_box=screen_box,
+        under=under_glass.crop(screen_box),
+        over=canvas_rgba.crop(screen_box),
+        glass_mask=glass_mask,
+    )
+
+
+def frame_iphone_screenshot(source: Image.Image) -> Image.Image:
+    screen = source.convert("RGBA")
+    template = build_frame_template(*screen.size)
+
+    region = Image.alpha_composite(template.under, clip_to_mask(screen, template.glass_mask))
+    region = Image.alpha_composite(region, template.over)
+
+    framed = template.background.copy()
+    framed.paste(region.convert("RGB"), template.screen_box[:2])
+    return framed
+
+
+def frame_number_key(path: Path) -> tuple[int, str]:
+    numbers = re.findall(r"\d+", path.stem)
+    return (int(numbers[-1]) if numbers else -1, path.name)
+
+
+def stream_frames(
+    frames: Iterable[Image.Image],
+    process: Callable[[int, Image.Image], object],
+    emit: Callable[[object], None],
+    workers: int,
+    queue_size: int,
+) -> int:
+    """Run `process` over frames on a thread pool and `emit` results in input order.
+
+    At most `queue_size` frames are decoded-but-not-emitted at any time, so
+    memory stays flat regardless of clip length. Pillow releases the GIL in
+    its compositing and codec paths, which is what lets the threads overlap.
+    """
+    pending: deque[Future] = deque()
+    count = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for index, frame in enumerate(frames):
+            pending.append(pool.submit(process, index, frame))
+            count += 1
+            if len(pending) >= queue_size:
+                emit(pending.popleft().result())
+        while pending:
+            emit(pending.popleft().result())
+    return count
+
+
+def probe_video(path: Path) -> tuple[int, int, str]:
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "stream=width,height,r_frame_rate",
+            "-of",
+            "json",
+            str(path),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    stream = json.loads(result.stdout)["streams"][0]
+    return int(stream["width"]), int(stream["height"]), stream["r_frame_rate"]
+
+
+def read_raw_frames(pipe, size: tuple[int, int]) -> Iterator[Image.Image]:
+    frame_bytes = size[0] * size[1] * 3
+    while True:
+        data = pipe.read(frame_bytes)
+        if len(data) < frame_bytes:
+            return
+        yield Image.frombytes("RGB", size, data)
+
+
+def frame_video(video_input: Path, video_output: Path, workers: int, queue_size: int) -> int:
+    width, height, frame_rate = probe_video(video_input)
+    framed_w, framed_h = build_frame_template(width, height).background.size
+
+    decoder = subprocess.Popen(
+        ["ffmpeg", "-v", "error", "-i", str(video_input), "-f", "rawvideo", "-pix_fmt", "rgb24", "-"],
+        stdout=subprocess.PIPE,
+    )
+    video_output.parent.mkdir(parents=True, exist_ok=True)
+    encoder = subprocess.Popen(
+        [
+            "ffmpeg",
+            "-v",
+            "error",
+            "-y",
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "rgb24",
+            "-s",
+            f"{framed_w}x{framed_h}",
+            "-r",
+            frame_rate,
+            "-i",
+            "-",
+            # yuv420p needs even dimensions; the framed canvas may be odd.
+            "-vf",
+            "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-c:v",
+            "libx264",
+            "-pix_fmt",
+            "yuv420p",
+            "-crf",
+            "18",
+            str(video_output),
+        ],
+        stdin=subprocess.PIPE,
+    )
+
+    encoder_gone = False
+    try:
+        count = stream_frames(
+            read_raw_frames(decoder.stdout, (width, height)),
+            lambda _, frame: frame_iphone_screenshot(frame).tobytes(),
+            encoder.stdin.write,
+            workers,
+            queue_size,
+        )
+    except BrokenPipeError:
+        # The encoder exited early; its exit status below says why.
+        encoder_gone = True
+    except BaseException:
+        for process in (decoder, encoder):
+            process.kill()
+        raise
+    finally:
+        close_pipe(encoder.stdin)
+        close_pipe(decoder.stdout)
+        if encoder_gone:
+            decoder.terminate()
+        decoder_status = decoder.wait()
+        encoder_status = encoder.wait()
+
+    if encoder_gone or decoder_status != 0 or encoder_status != 0:
+        raise RuntimeError(
+            f"ffmpeg failed while framing {video_input} (decoder exit {decoder_status}, encoder exit {encoder_status})"
+        )
+    return count
+
+
+def close_pipe(pipe) -> None:
+    # Closing a pipe whose reader is gone flushes into EPIPE; the process
+    # status is what gets reported.
+    try:
+        pipe.close()
+    except OSError:
+        pass
+
+
+def frame_sequence(source_files: list[Path], output_dir: Path, workers: int, queue_size: int) -> int:
+    def process(index: int, frame: Image.Image) -> Path:
+        output_path = output_dir / source_files[index].name
+        # Fast zlib level: sequence frames are intermediates for an encoder.
+        frame_iphone_screenshot(frame).save(output_path, format="PNG", compress_level=1)
+        return output_path
+
+    frames = (Image.open(path) for path in source_files)
+    return stream_frames(frames, process, lambda _: None, workers, queue_size)
 
 
 def main() -> int:
     args = parse_args()
+    workers = max(1, args.workers)
+    queue_size = args.queue_size or workers * 2
+    report = RunReport("framing")
+    try:
+        return run(args, workers, queue_size, report)
+    except Exception as exc:
+        report.add_failure(args.video_input or args.source_dir, exc)
+        raise
+    finally:
+        report.add_cache_info("frame_templates", build_frame_template)
+        report.add_cache_info("masks", rounded_mask)
+        if args.report:
+            report.write(args.report)
+
+
+def run(args: argparse.Namespace, workers: int, queue_size: int, report: RunReport) -> int:
+    if args.video_input:
+        video_input = Path(args.video_input)
+        video_output = Path(args.video_output)
+        started = time.perf_counter()
+        count = frame_video(video_input, video_output, workers, queue_size)
+        elapsed = time.perf_counter() - started
+        report.add_file(video_input, "frame", elapsed, video_input.stat().st_size, video_output.stat().st_size)
+        print(f"Rendered: {args.video_output}")
+        print(f"Framed {count} video frames in {elapsed:.1f}s ({count / max(elapsed, 1e-9):.1f} fps).")
+        return 0
+
     source_dir = Path(args.source_dir)
     output_dir = Path(args.output_dir)
     if not source_dir.exists():
         raise FileNotFoundError(f"Source directory does not exist: {source_dir}")
 
-    source_files = sorted(source_dir.glob("*.png"), key=natural_sort_key)
+    sort_key = frame_number_key if args.sequence else natural_sort_key
+    source_files = sorted(source_dir.glob("*.png"), key=sort_key)
     if not source_files:
         raise FileNotFoundError(f"No PNG screenshots found in: {source_dir}")
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    for source_path in source_files:
-        framed = frame_iphone_screenshot(Image.open(source_path))
+    if args.sequence:
+        started = time.perf_counter()
+        count = frame_sequence(source_files, output_dir, workers, queue_size)
+        elapsed = time.perf_counter() - started
+        report.add_file(
+            source_dir,
+            "frame",
+            elapsed,
+            sum(path.stat().st_size for path in source_files),
+            sum((output_dir / path.name).stat().st_size for path in source_files),
+        )
+        print(f"Framed {count} sequence frames into {output_dir} in {elapsed:.1f}s ({count / max(elapsed, 1e-9):.1f} fps).")
+        return 0
+
+    def decode(source_path: Path) -> tuple[Path, Image.Image]:
+        image = Image.open(source_path)
+        image.load()
+        report.add_file(source_path, bytes_read=source_path.stat().st_size)
+        return source_path, image
+
+    def render(job: tuple[Path, Image.Image]) -> tuple[Path, Image.Image]:
+        source_path, image = job
+        return source_path, frame_iphone_screenshot(image)
+
+    def encode(job: tuple[Path, Image.Image]) -> Path:
+        source_path, framed = job
         output_path = output_dir / source_path.name
         framed.save(output_path, format="PNG")
+        report.add_file(source_path, bytes_written=output_path.stat().st_size)
         print(f"Rendered: {output_path}")
+        return output_path
+
+    io_workers = max(1, args.io_workers)
+    result = run_pipeline(
+        source_files,
+        [Stage("decode", decode, io_workers), Stage("render", render, workers), Stage("encode", encode, io_workers)],
+        queue_size=queue_size,
+        observer=report.stage_observer(),
+    )
+    report.add_pipeline(result)
+    for line in result.report_lines():
+        print(line)
+
+    if result.failures:
+        print("Failed screenshots:")
+        for source_path, stage, exc in result.failures:
+            print(f"  - {source_path} ({stage}): {exc}")
+        return 1
 
-    print(f"Completed {len(source_files)} framed iPhone screenshots.")
+    print(f"Completed {len(result.results)} framed iPhone screenshots.")
     return 0
 
 
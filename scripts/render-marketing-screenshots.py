@@ -3,10 +3,16 @@
 from __future__ import annotations
 
 import argparse
+import math
 import textwrap
+from functools import lru_cache
 from pathlib import Path
+from typing import NamedTuple
 
 from PIL import Image, ImageDraw, ImageFilter, ImageFont
+from render_masks import clip_to_mask, rounded_mask
+from render_pipeline import Stage, run_pipeline
+from run_report import RunReport
 
 SHOT_DECK = [
     {
@@ -70,14 +76,32 @@ DEVICE_LABELS = {
     "ipad": "iPad",
 }
 
+BADGE_TEXT = "NOTELAYER"
+
+
+class TextTile(NamedTuple):
+    image: Image.Image
+    # Ink bounds relative to the draw origin; `image` covers exactly this box.
+    bbox: tuple[int, int, int, int]
+    advance: int
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Render marketing composites from raw screenshots.")
     parser.add_argument("--source-root", required=True, help="Root folder containing device raw folders.")
     parser.add_argument("--output-root", required=True, help="Root folder for rendered marketing assets.")
+    parser.add_argument("--io-workers", type=int, default=2, help="Decode and encode threads.")
+    parser.add_argument("--render-workers", type=int, default=1, help="Compositing threads.")
+    parser.add_argument(
+        "--panorama",
+        action="store_true",
+        help="Render the deck as one continuous strip sliced into per-screen PNGs under <device>/panorama/.",
+    )
+    parser.add_argument("--report", help="Write a JSON run report (timings, bytes, caches, peak RSS) here.")
     return parser.parse_args()
 
 
+@lru_cache(maxsize=64)
 def load_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
     candidates = FONT_BOLD_CANDIDATES if bold else FONT_REGULAR_CANDIDATES
     for path in candidates:
@@ -102,10 +126,67 @@ def draw_vertical_gradient(canvas: Image.Image, top: tuple[int, int, int], botto
         draw.line([(0, y), (width, y)], fill=interpolate_color(top, bottom, t))
 
 
-def rounded_mask(size: tuple[int, int], radius: int) -> Image.Image:
-    mask = Image.new("L", size, 0)
-    ImageDraw.Draw(mask).rounded_rectangle([(0, 0), (size[0], size[1])], radius=radius, fill=255)
-    return mask
+def mix_color(a: tuple[int, int, int], b: tuple[int, int, int], t: float) -> tuple[int, int, int]:
+    return tuple(round(a[i] + (b[i] - a[i]) * t) for i in range(3))
+
+
+def draw_bilinear_gradient(
+    size: tuple[int, int],
+    left: tuple[tuple[int, int, int], tuple[int, int, int]],
+    right: tuple[tuple[int, int, int], tuple[int, int, int]],
+) -> Image.Image:
+    """Blend a left (top, bottom) column gradient into a right one across `size`."""
+    width, height = size
+    columns = []
+    for top, bottom in (left, right):
+        column = Image.new("RGB", (1, height))
+        draw_vertical_gradient(column, top, bottom)
+        columns.append(column.resize(size, Image.Resampling.NEAREST))
+    ramp = Image.linear_gradient("L").transpose(Image.Transpose.TRANSPOSE).resize((width, 1), Image.Resampling.BILINEAR)
+    return Image.composite(columns[1], columns[0], ramp.resize(size, Image.Resampling.NEAREST))
+
+
+def draw_panorama_background(
+    size: tuple[int, int],
+    panel: int,
+    palettes: list[tuple[tuple[int, int, int], tuple[int, int, int]]],
+) -> Image.Image:
+    """One slice of the strip background, rendered in slice coordinates only.
+
+    The strip is laid out in panel units: panel `i` spans [i, i + 1) and its
+    palette sits at i + 0.5, with colors blending linearly between centers.
+    A light wave runs across the whole strip so the seams line up.
+    """
+    width, height = size
+    previous = palettes[max(0, panel - 1)]
+    current = palettes[panel]
+    following = palettes[min(len(palettes) - 1, panel + 1)]
+
+    def blend(a, b):
+        return mix_color(a[0], b[0], 0.5), mix_color(a[1], b[1], 0.5)
+
+    half = width // 2
+    canvas = Image.new("RGB", size)
+    canvas.paste(draw_bilinear_gradient((half, height), blend(previous, current), current), (0, 0))
+    canvas.paste(draw_bilinear_gradient((width - half, height), current, blend(current, following)), (half, 0))
+
+    wave = Image.new("RGBA", size, (0, 0, 0, 0))
+    wave_draw = ImageDraw.Draw(wave)
+    step = max(4, width // 160)
+    line_width = max(4, int(height * 0.01))
+    # Sample on a grid anchored at the strip origin, so neighbouring slices
+    # rasterize the same segments and joints across the seam, and overdraw far
+    # enough past each edge that no joint is cut off.
+    left = panel * width
+    margin = step * (line_width // step + 2)
+    first = -((left - margin) % step) - margin
+    for center, amplitude, alpha in ((0.17, 0.045, 46), (0.21, 0.03, 28)):
+        points = [
+            (x, height * (center + amplitude * math.sin(2 * math.pi * ((left + x) / width) / 1.5)))
+            for x in range(first, width + margin + step, step)
+        ]
+        wave_draw.line(points, fill=(255, 255, 255, alpha), width=line_width, joint="curve")
+    return Image.alpha_composite(canvas.convert("RGBA"), wave).convert("RGB")
 
 
 def wrap_text(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont, max_width: int, max_lines: int = 3) -> str:
@@ -136,68 +217,94 @@ def wrap_text(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont, m
     return "\n".join(lines)
 
 
-def render_marketing_asset(
-    source_path: Path,
-    output_path: Path,
+def tint_mask(mask: Image.Image, fill: tuple[int, int, int]) -> Image.Image:
+    tile = Image.new("RGBA", mask.size, (*fill, 0))
+    tile.putalpha(mask)
+    return tile
+
+
+@lru_cache(maxsize=256)
+def render_text_tile(
+    text: str,
+    size: int,
+    bold: bool,
+    max_width: int,
+    spacing: int,
+    fill: tuple[int, int, int],
+    max_lines: int = 1,
+) -> TextTile:
+    """Wrap, measure and draw a text block once; reused across shots, devices and locales."""
+    font = load_font(size, bold=bold)
+    scratch = ImageDraw.Draw(Image.new("L", (1, 1)))
+    wrapped = wrap_text(scratch, text, font, max_width, max_lines=max_lines) if max_lines > 1 else text
+    left, top, right, bottom = (int(value) for value in scratch.multiline_textbbox((0, 0), wrapped, font=font, spacing=spacing))
+    advance = int(scratch.textlength(wrapped, font=font)) if "\n" not in wrapped else right
+
+    mask = Image.new("L", (max(1, right - left), max(1, bottom - top)), 0)
+    ImageDraw.Draw(mask).multiline_text((-left, -top), wrapped, font=font, fill=255, spacing=spacing)
+    return TextTile(tint_mask(mask, fill), (left, top, right, bottom), advance)
+
+
+@lru_cache(maxsize=16)
+def render_badge_tile(font_size: int, width: int, height: int) -> TextTile:
+    """The NOTELAYER pill for a given canvas width and badge height."""
+    label = render_text_tile(BADGE_TEXT, font_size, True, 0, 0, (20, 25, 37))
+    box_w = int(label.advance + width * 0.07)
+
+    badge = tint_mask(rounded_mask((box_w + 1, height + 1), int(height * 0.5)), (255, 255, 255))
+    text_x = int(width * 0.028) + label.bbox[0]
+    text_y = int(height * 0.17) + label.bbox[1]
+    badge.alpha_composite(label.image, dest=(text_x, text_y))
+    return TextTile(badge, (0, 0, box_w, height), box_w)
+
+
+def paste_tile(canvas: Image.Image, tile: TextTile, origin: tuple[int, int]) -> tuple[int, int, int, int]:
+    """Composite `tile` as if drawn at `origin`; returns its bbox on the canvas."""
+    left, top, right, bottom = tile.bbox
+    canvas.alpha_composite(tile.image, dest=(origin[0] + left, origin[1] + top))
+    return origin[0] + left, origin[1] + top, origin[0] + right, origin[1] + bottom
+
+
+def compose_marketing_asset(
+    source: Image.Image,
     headline: str,
     subtitle: str,
     palette: tuple[tuple[int, int, int], tuple[int, int, int]],
     device_label: str,
-) -> None:
-    source = Image.open(source_path).convert("RGBA")
+    background: Image.Image | None = None,
+) -> Image.Image:
+    source = source.convert("RGBA")
     width, height = source.size
 
-    canvas = Image.new("RGB", (width, height), color=palette[0])
-    draw_vertical_gradient(canvas, palette[0], palette[1])
-    draw = ImageDraw.Draw(canvas)
-
-    badge_font = load_font(max(26, int(width * 0.027)), bold=True)
-    headline_font = load_font(max(44, int(width * 0.062)), bold=True)
-    subtitle_font = load_font(max(26, int(width * 0.03)), bold=False)
-    device_font = load_font(max(24, int(width * 0.025)), bold=True)
+    if background is None:
+        background = Image.new("RGB", (width, height), color=palette[0])
+        draw_vertical_gradient(background, palette[0], palette[1])
+    canvas = background.convert("RGBA")
 
     side_padding = int(width * 0.055)
     top_padding = int(height * 0.045)
     text_gap = int(height * 0.018)
+    text_width = width - side_padding * 2
 
-    badge_text = "NOTELAYER"
     badge_box_h = int(height * 0.05)
-    badge_box_w = int(draw.textlength(badge_text, font=badge_font) + width * 0.07)
-    badge_rect = [
-        side_padding,
-        top_padding,
-        side_padding + badge_box_w,
-        top_padding + badge_box_h,
-    ]
-    draw.rounded_rectangle(badge_rect, radius=int(badge_box_h * 0.5), fill=(255, 255, 255, 230))
-    draw.text((badge_rect[0] + width * 0.028, badge_rect[1] + badge_box_h * 0.17), badge_text, fill=(20, 25, 37), font=badge_font)
-
-    device_text = device_label.upper()
-    device_w = int(draw.textlength(device_text, font=device_font))
-    draw.text((width - side_padding - device_w, top_padding + badge_box_h * 0.15), device_text, fill=(244, 248, 255), font=device_font)
+    badge = render_badge_tile(max(26, int(width * 0.027)), width, badge_box_h)
+    badge_rect = paste_tile(canvas, badge, (side_padding, top_padding))
+
+    device_tile = render_text_tile(device_label.upper(), max(24, int(width * 0.025)), True, 0, 0, (244, 248, 255))
+    device_w = device_tile.advance
+    paste_tile(canvas, device_tile, (width - side_padding - device_w, top_padding + int(badge_box_h * 0.15)))
 
     headline_y = badge_rect[3] + text_gap
-    wrapped_headline = wrap_text(draw, headline, headline_font, width - side_padding * 2, max_lines=2)
-    draw.multiline_text(
-        (side_padding, headline_y),
-        wrapped_headline,
-        font=headline_font,
-        fill=(255, 255, 255),
-        spacing=int(height * 0.006),
+    headline_tile = render_text_tile(
+        headline, max(44, int(width * 0.062)), True, text_width, int(height * 0.006), (255, 255, 255), max_lines=2
     )
+    headline_box = paste_tile(canvas, headline_tile, (side_padding, headline_y))
 
-    headline_box = draw.multiline_textbbox((side_padding, headline_y), wrapped_headline, font=headline_font, spacing=int(height * 0.006))
     subtitle_y = headline_box[3] + int(height * 0.012)
-    wrapped_subtitle = wrap_text(draw, subtitle, subtitle_font, width - side_padding * 2, max_lines=2)
-    draw.multiline_text(
-        (side_padding, subtitle_y),
-        wrapped_subtitle,
-        font=subtitle_font,
-        fill=(236, 243, 255),
-        spacing=int(height * 0.004),
+    subtitle_tile = render_text_tile(
+        subtitle, max(26, int(width * 0.03)), False, text_width, int(height * 0.004), (236, 243, 255), max_lines=2
     )
-
-    subtitle_box = draw.multiline_textbbox((side_padding, subtitle_y), wrapped_subtitle, font=subtitle_font, spacing=int(height * 0.004))
+    subtitle_box = paste_tile(canvas, subtitle_tile, (side_padding, subtitle_y))
 
     frame_top = subtitle_box[3] + int(height * 0.03)
     frame_left = side_padding
@@ -214,7 +321,7 @@ def render_marketing_asset(
         fill=(0, 0, 0, 85),
     )
     shadow = shadow.filter(ImageFilter.GaussianBlur(radius=max(6, int(width * 0.008))))
-    canvas = Image.alpha_composite(canvas.convert("RGBA"), shadow)
+    canvas = Image.alpha_composite(canvas, shadow)
 
     panel = Image.new("RGBA", (width, height), (0, 0, 0, 0))
     panel_draw = ImageDraw.Draw(panel)
@@ -244,9 +351,7 @@ def render_marketing_asset(
     screenshot_radius = int(width * 0.04)
     mask = rounded_mask(resized.size, radius=screenshot_radius)
 
-    screenshot_layer = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-    screenshot_layer.paste(resized, (app_x, app_y), mask=mask)
-    canvas = Image.alpha_composite(canvas, screenshot_layer)
+    canvas.alpha_composite(clip_to_mask(resized, mask), dest=(app_x, app_y))
 
     border_layer = Image.new("RGBA", (width, height), (0, 0, 0, 0))
     border_draw = ImageDraw.Draw(border_layer)
@@ -258,19 +363,42 @@ def render_marketing_asset(
     )
     canvas = Image.alpha_composite(canvas, border_layer)
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    canvas.convert("RGB").save(output_path, format="PNG")
+    return canvas.convert("RGB")
+
+
+def compose_shot(source: Image.Image, shot: dict, device_label: str) -> Image.Image:
+    """Compose one deck entry; entries from collect_panorama_jobs carry their strip panel."""
+    background = None
+    if "panel" in shot:
+        palettes = [entry["palette"] for entry in SHOT_DECK]
+        background = draw_panorama_background(source.size, shot["panel"], palettes)
+    return compose_marketing_asset(
+        source,
+        headline=shot["headline"],
+        subtitle=shot["subtitle"],
+        palette=shot["palette"],
+        device_label=device_label,
+        background=background,
+    )
 
 
-def main() -> int:
-    args = parse_args()
-    source_root = Path(args.source_root)
-    output_root = Path(args.output_root)
+def render_marketing_asset(
+    source_path: Path,
+    output_path: Path,
+    headline: str,
+    subtitle: str,
+    palette: tuple[tuple[int, int, int], tuple[int, int, int]],
+    device_label: str,
+) -> None:
+    composed = compose_marketing_asset(Image.open(source_path), headline, subtitle, palette, device_label)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    composed.save(output_path, format="PNG")
 
-    if not source_root.exists():
-        raise FileNotFoundError(f"Source root does not exist: {source_root}")
 
+def collect_render_jobs(source_root: Path, output_root: Path) -> tuple[list[tuple[Path, Path, dict, str]], list[Path]]:
+    """Return (source, output, shot, device label) jobs plus any missing sources."""
     missing_inputs: list[Path] = []
+    jobs: list[tuple[Path, Path, dict, str]] = []
 
     for device_key, device_label in DEVICE_LABELS.items():
         device_input_dir = source_root / device_key
@@ -285,21 +413,105 @@ def main() -> int:
                 continue
 
             output_name = f"{index:02d}-{shot['slug']}.png"
-            output_path = output_root / device_key / output_name
-            render_marketing_asset(
-                source_path=source_path,
-                output_path=output_path,
-                headline=shot["headline"],
-                subtitle=shot["subtitle"],
-                palette=shot["palette"],
-                device_label=device_label,
-            )
-            print(f"Rendered: {output_path}")
+            jobs.append((source_path, output_root / device_key / output_name, shot, device_label))
+
+    return jobs, missing_inputs
+
+
+def collect_panorama_jobs(source_root: Path, output_root: Path) -> tuple[list[tuple[Path, Path, dict, str]], list[Path]]:
+    """Like collect_render_jobs, but one strip slice per shot under <device>/panorama/.
+
+    A device missing any deck screenshot gets no strip, since the slices only
+    line up as a full set.
+    """
+    jobs, missing_inputs = collect_render_jobs(source_root, output_root)
+    incomplete = {path.parent.name for path in missing_inputs}
+    panorama_jobs = []
+    for source_path, output_path, shot, device_label in jobs:
+        if output_path.parent.name in incomplete:
+            continue
+        panel = next(index for index, entry in enumerate(SHOT_DECK) if entry is shot)
+        panorama_jobs.append((source_path, output_path.parent / "panorama" / output_path.name, dict(shot, panel=panel), device_label))
+    return panorama_jobs, missing_inputs
+
+
+def record_caches(report: RunReport) -> None:
+    report.add_cache_info("fonts", load_font)
+    report.add_cache_info("text_tiles", render_text_tile)
+    report.add_cache_info("badges", render_badge_tile)
+    report.add_cache_info("masks", rounded_mask)
+
+
+def main() -> int:
+    args = parse_args()
+    report = RunReport("marketing-panorama" if args.panorama else "marketing")
+    try:
+        return run(args, report)
+    except Exception as exc:
+        report.add_failure(args.source_root, exc)
+        raise
+    finally:
+        record_caches(report)
+        if args.report:
+            report.write(args.report)
+
+
+def run(args: argparse.Namespace, report: RunReport) -> int:
+    source_root = Path(args.source_root)
+    output_root = Path(args.output_root)
+
+    if not source_root.exists():
+        raise FileNotFoundError(f"Source root does not exist: {source_root}")
+
+    collect = collect_panorama_jobs if args.panorama else collect_render_jobs
+    jobs, missing_inputs = collect(source_root, output_root)
+
+    def decode(job: tuple[Path, Path, dict, str]) -> tuple[tuple[Path, Path, dict, str], Image.Image]:
+        source = Image.open(job[0])
+        source.load()
+        report.add_file(job[0], bytes_read=job[0].stat().st_size)
+        return job, source
+
+    def render(decoded: tuple[tuple[Path, Path, dict, str], Image.Image]) -> tuple[Path, Path, Image.Image]:
+        (source_path, output_path, shot, device_label), source = decoded
+        return source_path, output_path, compose_shot(source, shot, device_label)
+
+    def encode(rendered: tuple[Path, Path, Image.Image]) -> Path:
+        source_path, output_path, composed = rendered
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        composed.save(output_path, format="PNG")
+        report.add_file(source_path, bytes_written=output_path.stat().st_size)
+        print(f"Rendered: {output_path}")
+        return output_path
+
+    io_workers = max(1, args.io_workers)
+    result = run_pipeline(
+        jobs,
+        [
+            Stage("decode", decode, io_workers),
+            Stage("render", render, max(1, args.render_workers)),
+            Stage("encode", encode, io_workers),
+        ],
+        queue_size=io_workers * 2,
+        observer=report.stage_observer(key=lambda job: job[0]),
+    )
+    report.add_pipeline(result, key=lambda job: job[0])
+    for path in missing_inputs:
+        report.add_failure(path, "missing source screenshot")
+    for line in result.report_lines():
+        print(line)
+
+    if result.failures:
+        print("Failed marketing renders:")
+        for job, stage, exc in result.failures:
+            print(f"  - {job[0]} ({stage}): {exc}")
 
     if missing_inputs:
         print("Missing source screenshots:")
         for path in missing_inputs:
             print(f"  - {path}")
+
+    if result.failures or missing_inputs:
         return 1
 
     print("Marketing composites complete.")
@@ -0,0 +1,559 @@
+#!/usr/bin/env python3
+"""Warm local render server for marketing composites and framed screenshots.
+
+`serve` keeps the renderers imported in one process, so fonts, decoded source
+screenshots, pre-rendered text tiles and iPhone frame templates stay resident
+between runs. It accepts batched jobs as HTTP over a per-user Unix socket
+(mode 0600) and runs them through render_pipeline's decode -> render ->
+encode stages; `--address host:port` serves localhost TCP instead. The
+`marketing` and `frame` commands are thin clients that take the same
+arguments as render-marketing-screenshots.py and
+render-iphone-framed-screenshots.py. If no server is listening they render
+in-process instead.
+
+POSTs must be `Content-Type: application/json` and carry no `Origin` header,
+so a web page cannot reach the TCP listener with a preflight-free
+`text/plain` form post.
+
+Endpoints:
+  GET  /health    liveness probe
+  GET  /metrics   active batches, in-flight tasks, latency percentiles, cache stats
+  POST /render    {"jobs": [{"kind": "marketing", "source_root": ..., "output_root": ..., "panorama": false},
+                            {"kind": "frame", "source_dir": ..., "output_dir": ...}]}
+  POST /shutdown  {} stop the server
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import importlib.util
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from collections import OrderedDict, deque
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, NamedTuple
+
+from PIL import Image
+from render_pipeline import Stage, run_pipeline
+from run_report import RunReport, peak_rss_bytes, write_json
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_ADDRESS = os.environ.get("NOTELAYER_RENDER_SERVER") or str(
+    Path(tempfile.gettempdir()) / f"notelayer-render-{os.getuid()}.sock"
+)
+
+
+def load_script(file_name: str, module_name: str) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPT_DIR / file_name)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+marketing = load_script("render-marketing-screenshots.py", "render_marketing_screenshots")
+framer = load_script("render-iphone-framed-screenshots.py", "render_iphone_framed_screenshots")
+
+
+def is_unix_address(address: str) -> bool:
+    return "/" in address
+
+
+def split_address(address: str) -> tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+class SourceCache:
+    """LRU of decoded source screenshots keyed by (path, mtime_ns, size)."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.entries: OrderedDict[tuple[str, int, int], Image.Image] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, path: Path, report: RunReport | None = None) -> Image.Image:
+        st = path.stat()
+        key = (str(path.resolve()), st.st_mtime_ns, st.st_size)
+        with self._lock:
+            image = self.entries.get(key)
+            if image is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return image
+            self.misses += 1
+
+        image = Image.open(path)
+        image.load()
+        if report is not None:
+            report.add_file(path, bytes_read=st.st_size)
+        with self._lock:
+            self.entries[key] = image
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return image
+
+
+JOB_PATH_KEYS = {"marketing": ("source_root", "output_root"), "frame": ("source_dir", "output_dir")}
+
+
+def validate_jobs(payload: Any) -> list[dict]:
+    """The `jobs` list of a /render body; raises ValueError describing the first problem."""
+    if not isinstance(payload, dict) or not isinstance(payload.get("jobs"), list):
+        raise ValueError('body must be an object with a "jobs" list')
+    for index, job in enumerate(payload["jobs"]):
+        if not isinstance(job, dict):
+            raise ValueError(f"jobs[{index}] must be an object")
+        kind = job.get("kind")
+        if kind not in JOB_PATH_KEYS:
+            raise ValueError(f"jobs[{index}] has unknown kind {kind!r}")
+        for key in JOB_PATH_KEYS[kind]:
+            if not isinstance(job.get(key), str) or not job[key]:
+                raise ValueError(f"jobs[{index}] ({kind}) needs a {key!r} path")
+    return payload["jobs"]
+
+
+class RenderTask(NamedTuple):
+    source_path: Path
+    output_path: Path
+    render: Callable[[Image.Image], Image.Image]
+
+
+class RenderService:
+    def __init__(self, workers: int, io_workers: int, cache_size: int) -> None:
+        self.workers = workers
+        self.io_workers = io_workers
+        # Concurrent batches each run their own pipeline; compositing shares these slots.
+        self.render_slots = threading.BoundedSemaphore(workers)
+        self.sources = SourceCache(cache_size)
+        self.started_at = time.time()
+        self.active_batches = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.batches = 0
+        self.task_latencies: deque[float] = deque(maxlen=2000)
+        self.batch_latencies: deque[float] = deque(maxlen=500)
+        self._lock = threading.Lock()
+
+    def collect_tasks(self, jobs: list[dict]) -> tuple[list[RenderTask], list[str], list[dict]]:
+        tasks: list[RenderTask] = []
+        missing: list[str] = []
+        errors: list[dict] = []
+        for job in jobs:
+            kind = job.get("kind")
+            if kind == "marketing":
+                source_root = Path(job["source_root"])
+                if not source_root.exists():
+                    errors.append({"path": str(source_root), "error": "Source root does not exist"})
+                    continue
+                collect = marketing.collect_panorama_jobs if job.get("panorama") else marketing.collect_render_jobs
+                render_jobs, missing_inputs = collect(source_root, Path(job["output_root"]))
+                missing.extend(str(path) for path in missing_inputs)
+                tasks.extend(
+                    RenderTask(source_path, output_path, partial(marketing.compose_shot, shot=shot, device_label=device_label))
+                    for source_path, output_path, shot, device_label in render_jobs
+                )
+            elif kind == "frame":
+                source_dir = Path(job["source_dir"])
+                output_dir = Path(job["output_dir"])
+                source_files = sorted(source_dir.glob("*.png"), key=framer.natural_sort_key)
+                if not source_files:
+                    errors.append({"path": str(source_dir), "error": "No PNG screenshots found"})
+                    continue
+                tasks.extend(
+                    RenderTask(source_path, output_dir / source_path.name, framer.frame_iphone_screenshot)
+                    for source_path in source_files
+                )
+            else:
+                errors.append({"path": "", "error": f"Unknown job kind: {kind!r}"})
+        return tasks, missing, errors
+
+    def run_batch(self, jobs: list[dict]) -> dict:
+        started = time.perf_counter()
+        report = RunReport("+".join(sorted({str(job.get("kind")) for job in jobs})) or "render-server")
+        caches_before = self.cache_stats()
+        tasks, missing, errors = self.collect_tasks(jobs)
+        with self._lock:
+            self.active_batches += 1
+            self.in_flight += len(tasks)
+
+        # Items carry the time they entered decode; task latency runs from there to the end of encode.
+        def decode(task: RenderTask) -> tuple[RenderTask, float, Image.Image]:
+            return task, time.perf_counter(), self.sources.get(task.source_path, report)
+
+        def render(decoded: tuple[RenderTask, float, Image.Image]) -> tuple[RenderTask, float, Image.Image]:
+            task, entered, source = decoded
+            with self.render_slots:
+                return task, entered, task.render(source)
+
+        def encode(rendered: tuple[RenderTask, float, Image.Image]) -> Path:
+            task, entered, image = rendered
+            task.output_path.parent.mkdir(parents=True, exist_ok=True)
+            image.save(task.output_path, format="PNG")
+            report.add_file(task.source_path, bytes_written=task.output_path.stat().st_size)
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+                self.task_latencies.append(time.perf_counter() - entered)
+            return task.output_path
+
+        result = run_pipeline(
+            tasks,
+            [
+                Stage("decode", decode, self.io_workers),
+                Stage("render", render, self.workers),
+                Stage("encode", encode, self.io_workers),
+            ],
+            queue_size=self.io_workers * 2,
+            observer=report.stage_observer(key=lambda task: task.source_path),
+        )
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.active_batches -= 1
+            self.in_flight -= len(result.failures)
+            self.failed += len(result.failures)
+            self.batches += 1
+            self.batch_latencies.append(elapsed)
+
+        for error in errors:
+            report.add_failure(error["path"], error["error"])
+        if tasks:
+            report.add_pipeline(result, key=lambda task: task.source_path)
+        errors.extend({"path": str(task.source_path), "error": f"{stage}: {exc}"} for task, stage, exc in result.failures)
+        for path in missing:
+            report.add_failure(path, "missing source screenshot")
+        # Server caches outlive batches; report what this batch did to them.
+        for name, after in self.cache_stats().items():
+            before = caches_before[name]
+            report.add_cache(name, after["hits"] - before["hits"], after["misses"] - before["misses"], after["entries"])
+
+        finished = set(result.results)
+        return {
+            "rendered": [str(task.output_path) for task in tasks if task.output_path in finished],
+            "missing": missing,
+            "errors": errors,
+            "seconds": round(elapsed, 3),
+            "pipeline": result.report_lines() if tasks else [],
+            "report": report.to_dict(),
+        }
+
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        stats = {"sources": {"entries": len(self.sources.entries), "hits": self.sources.hits, "misses": self.sources.misses}}
+        for name, cache in (
+            ("fonts", marketing.load_font),
+            ("text_tiles", marketing.render_text_tile),
+            ("frame_templates", framer.build_frame_template),
+            ("masks", marketing.rounded_mask),
+        ):
+            info = cache.cache_info()
+            stats[name] = {"entries": info.currsize, "hits": info.hits, "misses": info.misses}
+        return stats
+
+    def metrics(self) -> dict:
+        def percentiles(samples: deque[float]) -> dict:
+            ordered = sorted(samples)
+            if not ordered:
+                return {"count": 0}
+            pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 1)
+            return {"count": len(ordered), "p50_ms": pick(0.50), "p95_ms": pick(0.95), "max_ms": round(ordered[-1] * 1000, 1)}
+
+        with self._lock:
+            return {
+                "uptime_s": round(time.time() - self.started_at, 1),
+                "workers": self.workers,
+                "io_workers": self.io_workers,
+                "active_batches": self.active_batches,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "failed": self.failed,
+                "batches": self.batches,
+                "task_latency": percentiles(self.task_latencies),
+                "batch_latency": percentiles(self.batch_latencies),
+                "caches": self.cache_stats(),
+                "peak_rss_bytes": peak_rss_bytes(),
+            }
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    server: RenderHTTPServer
+
+    def send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self.send_json(200, {"status": "ok"})
+        elif self.path == "/metrics":
+            self.send_json(200, self.server.service.metrics())
+        else:
+            self.send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "local"
+
+    def reject_untrusted(self) -> bool:
+        if self.headers.get("Origin") is not None:
+            self.send_json(403, {"error": "Cross-origin requests are not accepted"})
+            return True
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            self.send_json(415, {"error": "Content-Type must be application/json"})
+            return True
+        return False
+
+    def do_POST(self) -> None:
+        # Drain the body before any reply so the client never writes into a closed socket.
+        try:
+            body = self.rfile.read(int(self.headers.get("Content-Length", "0")))
+        except ValueError as exc:
+            self.send_json(400, {"error": f"Invalid request: {exc}"})
+            return
+        if self.reject_untrusted():
+            return
+        if self.path == "/shutdown":
+            self.send_json(200, {"status": "stopping"})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        if self.path != "/render":
+            self.send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        try:
+            jobs = validate_jobs(json.loads(body or b"{}"))
+        except ValueError as exc:
+            self.send_json(400, {"error": f"Invalid request: {exc}"})
+            return
+        try:
+            result = self.server.service.run_batch(jobs)
+        except Exception as exc:
+            traceback.print_exc()
+            self.send_json(500, {"error": f"Render batch failed: {exc}"})
+            return
+        self.send_json(200, result)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class RenderHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: RenderService, verbose: bool) -> None:
+        super().__init__(address, RenderRequestHandler)
+        self.service = service
+        self.verbose = verbose
+
+
+class RenderUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, service: RenderService, verbose: bool) -> None:
+        # Create the socket owner-only; nobody else on the machine can connect.
+        previous_umask = os.umask(0o077)
+        try:
+            super().__init__(path, RenderRequestHandler)
+        finally:
+            os.umask(previous_umask)
+        self.service = service
+        self.verbose = verbose
+
+    def server_close(self) -> None:
+        super().server_close()
+        Path(self.server_address).unlink(missing_ok=True)
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float | None = None) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.unix_path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+def make_server(address: str, service: RenderService, verbose: bool) -> RenderHTTPServer | RenderUnixServer:
+    if not is_unix_address(address):
+        return RenderHTTPServer(split_address(address), service, verbose)
+    if os.path.lexists(address):
+        if not stat.S_ISSOCK(os.lstat(address).st_mode):
+            raise SystemExit(f"Refusing to replace {address}: it exists and is not a socket")
+        if server_available(address):
+            raise SystemExit(f"A render server is already listening on {address}")
+        os.unlink(address)  # stale socket from a server that did not shut down cleanly
+    return RenderUnixServer(address, service, verbose)
+
+
+def request(address: str, method: str, path: str, payload: dict | None = None, timeout: float | None = None) -> dict:
+    if is_unix_address(address):
+        connection: http.client.HTTPConnection = UnixHTTPConnection(address, timeout=timeout)
+    else:
+        connection = http.client.HTTPConnection(*split_address(address), timeout=timeout)
+    try:
+        body = json.dumps(payload or {}).encode("utf-8") if method == "POST" else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        data = json.loads(response.read() or b"{}")
+        if response.status != 200:
+            raise RuntimeError(data.get("error", f"HTTP {response.status}"))
+        return data
+    finally:
+        connection.close()
+
+
+def server_available(address: str) -> bool:
+    try:
+        request(address, "GET", "/health", timeout=0.5)
+        return True
+    except (OSError, RuntimeError, ValueError):
+        return False
+
+
+def submit_jobs(args: argparse.Namespace, jobs: list[dict]) -> dict:
+    if server_available(args.address):
+        return request(args.address, "POST", "/render", {"jobs": jobs})
+    if args.no_fallback:
+        raise SystemExit(f"Render server not reachable at {args.address}")
+    # No server running: same code path, cold caches.
+    return RenderService(workers=args.workers, io_workers=args.io_workers, cache_size=64).run_batch(jobs)
+
+
+def write_report(args: argparse.Namespace, result: dict) -> None:
+    if args.report and "report" in result:
+        write_json(args.report, result["report"])
+
+
+def print_batch(result: dict, missing_heading: str, done_message: str) -> int:
+    for path in result["rendered"]:
+        print(f"Rendered: {path}")
+    for line in result.get("pipeline", []):
+        print(line)
+    if result["errors"]:
+        print("Failed renders:")
+        for error in result["errors"]:
+            print(f"  - {error['path']}: {error['error']}")
+    if result["missing"]:
+        print(missing_heading)
+        for path in result["missing"]:
+            print(f"  - {path}")
+    if result["errors"] or result["missing"]:
+        return 1
+    print(done_message)
+    return 0
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    service = RenderService(workers=args.workers, io_workers=args.io_workers, cache_size=args.cache_size)
+    server = make_server(args.address, service, args.verbose)
+    print(f"Render server listening on {args.address} ({args.workers} workers)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def cmd_marketing(args: argparse.Namespace) -> int:
+    job = {
+        "kind": "marketing",
+        "source_root": str(Path(args.source_root).resolve()),
+        "output_root": str(Path(args.output_root).resolve()),
+        "panorama": args.panorama,
+    }
+    result = submit_jobs(args, [job])
+    write_report(args, result)
+    return print_batch(result, "Missing source screenshots:", "Marketing composites complete.")
+
+
+def cmd_frame(args: argparse.Namespace) -> int:
+    job = {"kind": "frame", "source_dir": str(Path(args.source_dir).resolve()), "output_dir": str(Path(args.output_dir).resolve())}
+    result = submit_jobs(args, [job])
+    write_report(args, result)
+    return print_batch(result, "Missing source screenshots:", f"Completed {len(result['rendered'])} framed iPhone screenshots.")
+
+
+def cmd_metrics(args: argparse.Namespace) -> int:
+    print(json.dumps(request(args.address, "GET", "/metrics", timeout=5), indent=2))
+    return 0
+
+
+def cmd_stop(args: argparse.Namespace) -> int:
+    if not server_available(args.address):
+        print(f"No render server at {args.address}")
+        return 0
+    request(args.address, "POST", "/shutdown", timeout=5)
+    print(f"Render server at {args.address} stopping.")
+    return 0
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Warm render server and client for screenshot renderers.")
+    parser.add_argument(
+        "--address",
+        default=DEFAULT_ADDRESS,
+        help="Unix socket path, or host:port for localhost TCP (env NOTELAYER_RENDER_SERVER).",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Render worker threads.")
+    parser.add_argument("--io-workers", type=int, default=2, help="Decode and encode threads per batch.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Run the server in the foreground.")
+    serve.add_argument("--cache-size", type=int, default=64, help="Decoded source screenshots kept in memory.")
+    serve.add_argument("--verbose", action="store_true", help="Log every request.")
+    serve.set_defaults(handler=cmd_serve)
+
+    marketing_cmd = commands.add_parser("marketing", help="Render marketing composites (render-marketing-screenshots.py args).")
+    marketing_cmd.add_argument("--source-root", required=True)
+    marketing_cmd.add_argument("--output-root", required=True)
+    marketing_cmd.add_argument("--panorama", action="store_true")
+    marketing_cmd.set_defaults(handler=cmd_marketing)
+
+    frame_cmd = commands.add_parser("frame", help="Render iPhone-framed screenshots (render-iphone-framed-screenshots.py args).")
+    frame_cmd.add_argument("--source-dir", required=True)
+    frame_cmd.add_argument("--output-dir", required=True)
+    frame_cmd.set_defaults(handler=cmd_frame)
+
+    for client in (marketing_cmd, frame_cmd):
+        client.add_argument("--no-fallback", action="store_true", help="Fail instead of rendering in-process.")
+        client.add_argument("--report", help="Write the batch's JSON run report here.")
+
+    commands.add_parser("metrics", help="Print server metrics as JSON.").set_defaults(handler=cmd_metrics)
+    commands.add_parser("stop", help="Stop a running server.").set_defaults(handler=cmd_stop)
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    args.workers = max(1, args.workers)
+    args.io_workers = max(1, args.io_workers)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,62 @@
+"""Anti-aliased rounded-rectangle masks shared by the screenshot renderers.
+
+A corner is drawn once per (radius, supersample) at `supersample` times its
+size and box-filtered down, which gives the arc real coverage values instead
+of ImageDraw's hard 0/255 edge. A mask of any size is then a solid fill plus
+four pasted (mirrored) corner tiles, so its cost barely depends on the image
+size. Finished masks are kept in an LRU because the renderers ask for the
+same few sizes over and over.
+
+Returned images are shared cache entries: use them as masks or copy them,
+never draw on them. To cut an RGBA image with a soft mask, use clip_to_mask
+rather than `paste(..., mask=)` onto a transparent layer, which blends the
+color channels toward black along the anti-aliased edge.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+from PIL import Image, ImageChops, ImageDraw
+
+DEFAULT_SUPERSAMPLE = 4
+
+
+@lru_cache(maxsize=64)
+def corner_tiles(radius: int, supersample: int = DEFAULT_SUPERSAMPLE) -> tuple[Image.Image, Image.Image, Image.Image, Image.Image]:
+    """Top-left, top-right, bottom-left and bottom-right `radius`-sized corner tiles."""
+    scaled = radius * max(1, supersample)
+    quarter = Image.new("L", (scaled, scaled), 0)
+    # Full circle anchored at the origin; the tile keeps only its top-left quadrant.
+    ImageDraw.Draw(quarter).ellipse([0, 0, scaled * 2 - 1, scaled * 2 - 1], fill=255)
+    top_left = quarter.resize((radius, radius), Image.Resampling.BOX)
+    return (
+        top_left,
+        top_left.transpose(Image.Transpose.FLIP_LEFT_RIGHT),
+        top_left.transpose(Image.Transpose.FLIP_TOP_BOTTOM),
+        top_left.transpose(Image.Transpose.ROTATE_180),
+    )
+
+
+@lru_cache(maxsize=32)
+def rounded_mask(size: tuple[int, int], radius: int, supersample: int = DEFAULT_SUPERSAMPLE) -> Image.Image:
+    """`L` mask of a `size` rounded rectangle; radius is clamped to half the short side."""
+    width, height = size
+    radius = max(0, min(radius, width // 2, height // 2))
+    mask = Image.new("L", (width, height), 255)
+    if radius == 0:
+        return mask
+
+    top_left, top_right, bottom_left, bottom_right = corner_tiles(radius, supersample)
+    mask.paste(top_left, (0, 0))
+    mask.paste(top_right, (width - radius, 0))
+    mask.paste(bottom_left, (0, height - radius))
+    mask.paste(bottom_right, (width - radius, height - radius))
+    return mask
+
+
+def clip_to_mask(image: Image.Image, mask: Image.Image) -> Image.Image:
+    """Copy of RGBA `image` with `mask` multiplied into its alpha channel."""
+    clipped = image.copy()
+    clipped.putalpha(ImageChops.multiply(image.getchannel("A"), mask))
+    return clipped
@@ -0,0 +1,133 @@
+"""Staged thread pipeline shared by the screenshot renderers.
+
+Each stage (decode -> render -> encode) runs on its own worker threads and
+hands items to the next stage through a bounded queue, so disk reads, PNG
+zlib work and compositing overlap instead of running strictly in sequence.
+Pillow releases the GIL in its codec and compositing paths, which is what
+makes thread workers pay off here.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, NamedTuple
+
+_DONE = object()
+
+
+class Stage(NamedTuple):
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+
+
+class StageStats:
+    def __init__(self, name: str, workers: int) -> None:
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.items += 1
+            self.busy_seconds += seconds
+
+    def utilization(self, wall_seconds: float) -> float:
+        return self.busy_seconds / max(wall_seconds * self.workers, 1e-9)
+
+    def items_per_second(self) -> float:
+        # Throughput the stage could sustain on its own with all its workers busy.
+        return self.items * self.workers / max(self.busy_seconds, 1e-9)
+
+
+class PipelineResult(NamedTuple):
+    results: list[Any]
+    failures: list[tuple[Any, str, BaseException]]
+    stats: list[StageStats]
+    wall_seconds: float
+
+    def report_lines(self) -> list[str]:
+        completed = len(self.results)
+        lines = [
+            f"Pipeline: {completed} items in {self.wall_seconds:.2f}s "
+            f"({completed / max(self.wall_seconds, 1e-9):.2f} items/s)"
+        ]
+        limiting = max(self.stats, key=lambda stats: stats.utilization(self.wall_seconds), default=None)
+        for stats in self.stats:
+            marker = "  <- limiting stage" if stats is limiting and len(self.stats) > 1 else ""
+            lines.append(
+                f"  {stats.name:<7} {stats.items:>4} items  busy {stats.busy_seconds:6.2f}s  "
+                f"workers {stats.workers}  capacity {stats.items_per_second():7.2f} items/s  "
+                f"utilization {stats.utilization(self.wall_seconds):4.0%}{marker}"
+            )
+        return lines
+
+
+def run_pipeline(
+    items: Iterable[Any],
+    stages: list[Stage],
+    queue_size: int = 4,
+    observer: Callable[[Any, str, float], None] | None = None,
+) -> PipelineResult:
+    """Push `items` through `stages`; returns final-stage outputs in completion order.
+
+    An item whose stage raises is recorded in `failures` with the stage name
+    and skips the remaining stages; other items keep flowing. `observer`, if
+    given, is called from worker threads with (item, stage name, seconds)
+    after every stage an item passes through.
+    """
+    queues: list[queue.Queue] = [queue.Queue(maxsize=max(1, queue_size)) for _ in stages]
+    stats = [StageStats(stage.name, max(1, stage.workers)) for stage in stages]
+    results: list[Any] = []
+    failures: list[tuple[Any, str, BaseException]] = []
+
+    def work(index: int) -> None:
+        stage = stages[index]
+        inbox = queues[index]
+        outbox = queues[index + 1] if index + 1 < len(stages) else None
+        while True:
+            job = inbox.get()
+            if job is _DONE:
+                return
+            item, value = job
+            started = time.perf_counter()
+            try:
+                value = stage.fn(value)
+            except Exception as exc:
+                failures.append((item, stage.name, exc))
+                continue
+            finally:
+                elapsed = time.perf_counter() - started
+                stats[index].record(elapsed)
+                if observer is not None:
+                    observer(item, stage.name, elapsed)
+            if outbox is None:
+                results.append(value)
+            else:
+                outbox.put((item, value))
+
+    threads = [
+        [threading.Thread(target=work, args=(index,), name=f"{stage.name}-{n}", daemon=True) for n in range(stats[index].workers)]
+        for index, stage in enumerate(stages)
+    ]
+    started = time.perf_counter()
+    for stage_threads in threads:
+        for thread in stage_threads:
+            thread.start()
+
+    for item in items:
+        queues[0].put((item, item))
+
+    # Drain stage by stage so each stage sees its end marker only after the
+    # previous stage has pushed everything downstream.
+    for index, stage_threads in enumerate(threads):
+        for _ in stage_threads:
+            queues[index].put(_DONE)
+        for thread in stage_threads:
+            thread.join()
+
+    return PipelineResult(results, failures, stats, time.perf_counter() - started)
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""Structured JSON run reports for the screenshot pipeline's Python stages.
+
+Each stage (attachment export, framing, marketing render) fills a RunReport
+and writes it with `--report PATH`. Recorded data: per-file timings split by
+phase, bytes read and written, cache hit/miss counters, peak RSS and
+failures. `summarize` merges a run's reports into one summary. It can also
+append a one-line record to a history file so pipeline speed can be compared
+across runs.
+
+  python3 scripts/run_report.py summarize REPORTS_DIR [--output summary.json] [--history history.jsonl]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+SCHEMA_VERSION = 1
+
+
+def peak_rss_bytes() -> int:
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def format_bytes(size: float) -> str:
+    if size < 1024:
+        return f"{size:.0f} B"
+    for unit in ("KB", "MB"):
+        size /= 1024
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+    return f"{size / 1024:.1f} GB"
+
+
+class RunReport:
+    """Thread-safe collector; renderer worker threads record into one instance."""
+
+    def __init__(self, stage: str) -> None:
+        self.stage = stage
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        self._files: dict[str, dict[str, Any]] = {}
+        self._failures: list[dict[str, str]] = []
+        self._caches: dict[str, dict[str, int]] = {}
+        self._pipeline: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add_file(
+        self,
+        path: Path | str,
+        phase: str | None = None,
+        seconds: float = 0.0,
+        bytes_read: int = 0,
+        bytes_written: int = 0,
+    ) -> None:
+        """Accumulate timings and I/O for `path`; call once per phase or per measurement."""
+        with self._lock:
+            entry = self._files.setdefault(
+                str(path), {"path": str(path), "seconds": 0.0, "phases": {}, "bytes_read": 0, "bytes_written": 0}
+            )
+            if phase:
+                entry["phases"][phase] = entry["phases"].get(phase, 0.0) + seconds
+            entry["seconds"] += seconds
+            entry["bytes_read"] += bytes_read
+            entry["bytes_written"] += bytes_written
+
+    def add_failure(self, path: Path | str, error: BaseException | str, phase: str | None = None) -> None:
+        with self._lock:
+            self._failures.append({"path": str(path), "phase": phase or "", "error": str(error)})
+
+    def add_cache(self, name: str, hits: int, misses: int, entries: int | None = None) -> None:
+        with self._lock:
+            self._caches[name] = {"hits": hits, "misses": misses, "entries": entries if entries is not None else -1}
+
+    def add_cache_info(self, name: str, cache: Callable[..., Any]) -> None:
+        """Record a functools.lru_cache-wrapped function's counters."""
+        info = cache.cache_info()
+        self.add_cache(name, info.hits, info.misses, info.currsize)
+
+    def stage_observer(self, key: Callable[[Any], Any] = lambda item: item) -> Callable[[Any, str, float], None]:
+        """An observer for render_pipeline.run_pipeline that times each item per stage."""
+        return lambda item, phase, seconds: self.add_file(key(item), phase, seconds)
+
+    def add_pipeline(self, result: Any, key: Callable[[Any], Any] = lambda item: item) -> None:
+        """Record stage utilization and failures from a render_pipeline.PipelineResult."""
+        limiting = max(result.stats, key=lambda stats: stats.utilization(result.wall_seconds), default=None)
+        with self._lock:
+            self._pipeline = [
+                {
+                    "name": stats.name,
+                    "workers": stats.workers,
+                    "items": stats.items,
+                    "busy_seconds": round(stats.busy_seconds, 4),
+                    "utilization": round(stats.utilization(result.wall_seconds), 4),
+                    "limiting": stats is limiting,
+                }
+                for stats in result.stats
+            ]
+        for item, phase, exc in result.failures:
+            self.add_failure(key(item), exc, phase)
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            files = sorted(self._files.values(), key=lambda entry: entry["path"])
+            files = [
+                dict(entry, seconds=round(entry["seconds"], 4), phases={k: round(v, 4) for k, v in entry["phases"].items()})
+                for entry in files
+            ]
+            return {
+                "schema": SCHEMA_VERSION,
+                "stage": self.stage,
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "wall_seconds": round(time.perf_counter() - self._started, 4),
+                "peak_rss_bytes": peak_rss_bytes(),
+                "totals": {
+                    "files": len(files),
+                    "failures": len(self._failures),
+                    "seconds": round(sum(entry["seconds"] for entry in files), 4),
+                    "bytes_read": sum(entry["bytes_read"] for entry in files),
+                    "bytes_written": sum(entry["bytes_written"] for entry in files),
+                },
+                "files": files,
+                "caches": dict(self._caches),
+                "pipeline": list(self._pipeline),
+                "failures": list(self._failures),
+            }
+
+    def write(self, path: Path | str) -> None:
+        write_json(path, self.to_dict())
+
+
+def write_json(path: Path | str, data: dict[str, Any]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def load_reports(paths: list[Path]) -> list[dict[str, Any]]:
+    report_paths: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            report_paths.extend(sorted(candidate for candidate in path.glob("*.json") if candidate.name != "summary.json"))
+        elif path.exists():
+            report_paths.append(path)
+        else:
+            raise FileNotFoundError(f"Report does not exist: {path}")
+
+    reports = []
+    for path in report_paths:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("schema") == SCHEMA_VERSION:
+            reports.append(data)
+    return reports
+
+
+def summarize(reports: list[dict[str, Any]], slowest: int = 5) -> dict[str, Any]:
+    stages = []
+    caches: dict[str, dict[str, int]] = {}
+    files = []
+    failures = []
+    for report in reports:
+        totals = report["totals"]
+        stages.append(
+            {
+                "stage": report["stage"],
+                "wall_seconds": report["wall_seconds"],
+                "files": totals["files"],
+                "failures": totals["failures"],
+                "bytes_read": totals["bytes_read"],
+                "bytes_written": totals["bytes_written"],
+                "peak_rss_bytes": report["peak_rss_bytes"],
+                "limiting_phase": next((phase["name"] for phase in report["pipeline"] if phase["limiting"]), None),
+            }
+        )
+        for name, counters in report["caches"].items():
+            merged = caches.setdefault(name, {"hits": 0, "misses": 0})
+            merged["hits"] += counters["hits"]
+            merged["misses"] += counters["misses"]
+        files.extend(dict(entry, stage=report["stage"]) for entry in report["files"])
+        failures.extend(dict(failure, stage=report["stage"]) for failure in report["failures"])
+
+    for counters in caches.values():
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = round(counters["hits"] / lookups, 4) if lookups else 0.0
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "started_at": min((report["started_at"] for report in reports), default=None),
+        "stages": stages,
+        "totals": {
+            "stages": len(reports),
+            "files": sum(stage["files"] for stage in stages),
+            "failures": len(failures),
+            "wall_seconds": round(sum(stage["wall_seconds"] for stage in stages), 4),
+            "bytes_read": sum(stage["bytes_read"] for stage in stages),
+            "bytes_written": sum(stage["bytes_written"] for stage in stages),
+            "peak_rss_bytes": max((stage["peak_rss_bytes"] for stage in stages), default=0),
+        },
+        "caches": caches,
+        "slowest_files": [
+            {"stage": entry["stage"], "path": entry["path"], "seconds": entry["seconds"]}
+            for entry in sorted(files, key=lambda entry: entry["seconds"], reverse=True)[:slowest]
+        ],
+        "failures": failures,
+    }
+
+
+def summary_lines(summary: dict[str, Any]) -> list[str]:
+    totals = summary["totals"]
+    lines = [
+        f"Run summary: {totals['stages']} stages, {totals['files']} files, {totals['failures']} failures, "
+        f"{totals['wall_seconds']:.2f}s, peak RSS {format_bytes(totals['peak_rss_bytes'])}"
+    ]
+    for stage in summary["stages"]:
+        limiting = f"  limiting {stage['limiting_phase']}" if stage["limiting_phase"] else ""
+        lines.append(
+            f"  {stage['stage']:<16} {stage['files']:>4} files  {stage['wall_seconds']:7.2f}s  "
+            f"read {format_bytes(stage['bytes_read']):>9}  wrote {format_bytes(stage['bytes_written']):>9}  "
+            f"rss {format_bytes(stage['peak_rss_bytes']):>9}{limiting}"
+        )
+    if summary["caches"]:
+        lines.append(
+            "  caches: "
+            + ", ".join(
+                f"{name} {counters['hits']}/{counters['hits'] + counters['misses']} hits"
+                for name, counters in sorted(summary["caches"].items())
+            )
+        )
+    if summary["slowest_files"]:
+        lines.append("  slowest files:")
+        lines.extend(f"    {entry['seconds']:6.2f}s  [{entry['stage']}] {entry['path']}" for entry in summary["slowest_files"])
+    if summary["failures"]:
+        lines.append("  failures:")
+        lines.extend(
+            f"    - [{failure['stage']}] {failure['path']}{' (' + failure['phase'] + ')' if failure['phase'] else ''}: {failure['error']}"
+            for failure in summary["failures"]
+        )
+    return lines
+
+
+def cmd_summarize(args: argparse.Namespace) -> int:
+    reports = load_reports([Path(path) for path in args.reports])
+    if not reports:
+        print("No run reports found.")
+        return 1
+
+    summary = summarize(reports, slowest=args.slowest)
+    for line in summary_lines(summary):
+        print(line)
+
+    if args.output:
+        write_json(args.output, summary)
+    if args.history:
+        record = {"started_at": summary["started_at"], **summary["totals"], "stages": {s["stage"]: s["wall_seconds"] for s in summary["stages"]}}
+        Path(args.history).parent.mkdir(parents=True, exist_ok=True)
+        with Path(args.history).open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(record, sort_keys=True) + "\n")
+    return 0
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Summarize screenshot pipeline run reports.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    summarize_cmd = commands.add_parser("summarize", help="Merge stage reports into one summary.")
+    summarize_cmd.add_argument("reports", nargs="+", help="Report JSON files or directories of them.")
+    summarize_cmd.add_argument("--output", help="Write the merged summary JSON here.")
+    summarize_cmd.add_argument("--history", help="Append a one-line run record to this JSONL file.")
+    summarize_cmd.add_argument("--slowest", type=int, default=5, help="Slowest files to list.")
+    summarize_cmd.set_defaults(handler=cmd_summarize)
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
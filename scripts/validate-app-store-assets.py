@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Header-only App Store screenshot validator.
+
+Reads the PNG signature, IHDR and chunk headers of every PNG under the given
+paths without decoding pixels. Checks each file against the App Store
+screenshot sizes for its device class, color type, alpha presence, and file
+size. Output follows scripts/pre-submission-check.sh.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Accepted portrait sizes per display class; landscape is the same pair swapped.
+DEVICE_SIZES: dict[str, dict[str, list[tuple[int, int]]]] = {
+    "iphone": {
+        '6.9"': [(1260, 2736), (1320, 2868), (1290, 2796)],
+        '6.5"': [(1242, 2688), (1284, 2778)],
+        '6.3"': [(1179, 2556), (1206, 2622)],
+        '6.1"': [(1170, 2532), (1125, 2436), (1080, 2340)],
+        '5.5"': [(1242, 2208)],
+        '4.7"': [(750, 1334)],
+    },
+    "ipad": {
+        '13"': [(2064, 2752), (2048, 2732)],
+        '11"': [(1488, 2266), (1668, 2420), (1668, 2388), (1640, 2360)],
+        '10.5"': [(1668, 2224)],
+        '9.7"': [(1536, 2048)],
+    },
+}
+
+DEVICE_LABELS = {
+    "iphone": "iPhone",
+    "ipad": "iPad",
+}
+
+COLOR_TYPES = {
+    0: "Grayscale",
+    2: "RGB",
+    3: "Indexed",
+    4: "Grayscale+Alpha",
+    6: "RGBA",
+}
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+
+
+class PngHeader(NamedTuple):
+    width: int
+    height: int
+    bit_depth: int
+    color_type: int
+    interlace: int
+    chunk_types: frozenset[str]
+    complete: bool
+
+
+class AssetResult(NamedTuple):
+    path: Path
+    device: str | None
+    display: str | None
+    summary: str
+    failures: list[str]
+
+
+def read_png_header(path: Path) -> PngHeader:
+    """Parse IHDR and walk chunk headers, seeking over chunk data."""
+    with path.open("rb") as handle:
+        if handle.read(8) != PNG_SIGNATURE:
+            raise ValueError("not a PNG file")
+
+        length, chunk_type = struct.unpack(">I4s", handle.read(8))
+        if chunk_type != b"IHDR" or length != 13:
+            raise ValueError("missing IHDR chunk")
+        width, height, bit_depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", handle.read(13))
+        handle.seek(4, os.SEEK_CUR)
+
+        chunk_types = {"IHDR"}
+        complete = False
+        while True:
+            header = handle.read(8)
+            if len(header) < 8:
+                break
+            length, chunk_type = struct.unpack(">I4s", header)
+            name = chunk_type.decode("latin-1")
+            chunk_types.add(name)
+            if name == "IEND":
+                complete = True
+                break
+            handle.seek(length + 4, os.SEEK_CUR)
+
+    return PngHeader(width, height, bit_depth, color_type, interlace, frozenset(chunk_types), complete)
+
+
+def detect_device(path: Path) -> str | None:
+    for part in reversed([part.lower() for part in path.parts]):
+        for device in DEVICE_SIZES:
+            if part == device or part.startswith(f"{device}-") or part.startswith(f"{device}_"):
+                return device
+    return None
+
+
+def match_display(device: str | None, width: int, height: int) -> tuple[str | None, str | None]:
+    portrait = (min(width, height), max(width, height))
+    devices = [device] if device else list(DEVICE_SIZES)
+    for candidate in devices:
+        for display, sizes in DEVICE_SIZES[candidate].items():
+            if portrait in sizes:
+                return candidate, display
+    return device, None
+
+
+def format_bytes(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MB" if size >= 1024 * 1024 else f"{size / 1024:.0f} KB"
+
+
+def validate_asset(path: Path, device_override: str | None, max_bytes: int) -> AssetResult:
+    device = device_override or detect_device(path)
+    failures: list[str] = []
+    try:
+        size = path.stat().st_size
+        header = read_png_header(path)
+    except (OSError, ValueError, struct.error) as exc:
+        return AssetResult(path, device, None, "unreadable", [str(exc)])
+
+    device, display = match_display(device, header.width, header.height)
+    color = COLOR_TYPES.get(header.color_type, f"color type {header.color_type}")
+    summary = f"{header.width}x{header.height}, {color} {header.bit_depth}-bit, {format_bytes(size)}"
+
+    if display is None:
+        scope = DEVICE_LABELS[device] if device else "iPhone/iPad"
+        failures.append(f"{header.width}x{header.height} is not an App Store {scope} screenshot size")
+    if header.color_type in (4, 6) or "tRNS" in header.chunk_types:
+        failures.append("has alpha channel or transparency (flatten to RGB)")
+    elif header.color_type != 2:
+        failures.append(f"{color} color (expected RGB)")
+    if "acTL" in header.chunk_types:
+        failures.append("animated PNG")
+    if not header.complete:
+        failures.append("truncated (no IEND chunk)")
+    if size > max_bytes:
+        failures.append(f"{format_bytes(size)} exceeds {format_bytes(max_bytes)} limit")
+
+    return AssetResult(path, device, display, summary, failures)
+
+
+def collect_pngs(roots: list[Path]) -> list[Path]:
+    paths: list[Path] = []
+    for root in roots:
+        if root.is_dir():
+            paths.extend(sorted(path for path in root.rglob("*.png") if path.is_file()))
+        elif root.exists():
+            paths.append(root)
+        else:
+            raise FileNotFoundError(f"Path does not exist: {root}")
+    return paths
+
+
+def expected_line(device: str | None) -> str:
+    devices = [device] if device else list(DEVICE_SIZES)
+    displays = " or ".join(f"{DEVICE_LABELS[candidate]} {'/'.join(DEVICE_SIZES[candidate])}" for candidate in devices)
+    return f"{displays} size; RGB, no alpha"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Validate rendered PNGs against App Store screenshot rules.")
+    parser.add_argument("paths", nargs="+", help="PNG files or directories to scan recursively.")
+    parser.add_argument("--device", choices=sorted(DEVICE_SIZES), help="Device class (default: from path names).")
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES, help="Per-file size limit.")
+    parser.add_argument("--workers", type=int, default=min(32, (os.cpu_count() or 1) * 4), help="Parallel readers.")
+    parser.add_argument("--failures-only", action="store_true", help="Only print files that fail.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    paths = collect_pngs([Path(path) for path in args.paths])
+
+    print("==========================================")
+    print("App Store Screenshot Asset Check")
+    print("==========================================")
+    print("")
+
+    if not paths:
+        print("❌ No PNG files found.")
+        return 1
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        results = list(pool.map(lambda path: validate_asset(path, args.device, args.max_bytes), paths))
+
+    for number, result in enumerate(results, start=1):
+        if args.failures_only and not result.failures:
+            continue
+        device = result.device or "unknown device"
+        print(f"{number}. {result.path}")
+        print(f"   Expected: {expected_line(result.device)}, <= {format_bytes(args.max_bytes)}")
+        print(f"   Found:    {result.summary} ({device}{' ' + result.display if result.display else ''})")
+        if result.failures:
+            for failure in result.failures:
+                print(f"   Status:   ❌ {failure}")
+        else:
+            print("   Status:   ✅ MATCH")
+        print("")
+
+    failed = [result for result in results if result.failures]
+    print("==========================================")
+    print("Summary")
+    print("==========================================")
+    print(f"Files checked:    {len(results)}")
+    print(f"Passed:           {len(results) - len(failed)}")
+    print(f"Failed:           {len(failed)}")
+    print("")
+
+    if failed:
+        print("❌ Some checks failed. Please review the output above.")
+        return 1
+    print("✅ All checks passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,17 +1,43 @@
 from __future__ import annotations
 
-from datetime import date
+import argparse
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timezone
+from functools import lru_cache
 from pathlib import Path
+from typing import NamedTuple
 
 from reportlab.lib.colors import HexColor
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.pdfgen import canvas
 
 OUTPUT_PATH = Path("output/pdf/notelayer_app_summary_one_pager.pdf")
+DOCS_OUTPUT_DIR = Path("output/pdf/docs")
+COMBINED_OUTPUT_PATH = Path("output/pdf/notelayer_docs_combined.pdf")
+CACHE_PATH = Path("output/pdf/.render-cache.json")
+
+# Bump when drawing code changes in a way the cache key cannot see.
+RENDER_VERSION = 1
+
+
+def generated_on() -> date:
+    # SOURCE_DATE_EPOCH is the reproducible-builds convention for pinning build dates.
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), tz=timezone.utc).date()
+    return date.today()
+
+
+GENERATED_ON = generated_on().isoformat()
 
 TITLE = "Notelayer iOS - One-Page Summary"
-SUBTITLE = f"Repo evidence only | Generated {date.today().isoformat()}"
+SUBTITLE = f"Repo evidence only | Generated {GENERATED_ON}"
 
 SECTIONS = [
     (
@@ -87,11 +113,42 @@ BOTTOM_MARGIN = 28
 TEXT_WIDTH = PAGE_WIDTH - (MARGIN_X * 2)
 
 
+DOC_SIZES = (9.6, 11.0, 6.8)
+
+
+class DocLayout(NamedTuple):
+    """Pre-wrapped document ready to draw; produced in worker processes."""
+
+    title: str
+    subtitle: str
+    sections: list[tuple[str, list[list[str]]]]
+    source_lines: list[str]
+    sizes: tuple[float, float, float]
+
+
+@lru_cache(maxsize=8192)
+def _wrapped_lines(text: str, font_name: str, font_size: float, width: float) -> tuple[str, ...]:
+    return tuple(simpleSplit(text, font_name, font_size, width))
+
+
 def wrapped_lines(text: str, font_name: str, font_size: float, width: float) -> list[str]:
-    return simpleSplit(text, font_name, font_size, width)
+    return list(_wrapped_lines(text, font_name, font_size, width))
+
+
+def warm_font_metrics() -> None:
+    # Standard-font width tables load lazily; warm them once per pool worker
+    # instead of on the first wrap of every document.
+    for font_name in ("Helvetica", "Helvetica-Bold"):
+        stringWidth("Notelayer", font_name, 10)
 
 
-def measure_height(body_size: float, heading_size: float, source_size: float) -> float:
+def measure_height(
+    body_size: float,
+    heading_size: float,
+    source_size: float,
+    sections: list[tuple[str, list[str]]] = SECTIONS,
+    sources: list[str] = SOURCES,
+) -> float:
     title_size = heading_size + 5.0
     subtitle_size = body_size - 0.6
 
@@ -103,14 +160,14 @@ def measure_height(body_size: float, heading_size: float, source_size: float) ->
     total += title_size + 6.0
     total += subtitle_size + 14.0
 
-    for heading, items in SECTIONS:
+    for heading, items in sections:
         total += heading_leading + 2.0
         for item in items:
             lines = wrapped_lines(f"- {item}", "Helvetica", body_size, TEXT_WIDTH)
             total += (len(lines) * body_leading) + 1.8
         total += 3.6
 
-    source_text = "Sources: " + ", ".join(SOURCES)
+    source_text = "Sources: " + ", ".join(sources)
     source_lines = wrapped_lines(source_text, "Helvetica", source_size, TEXT_WIDTH)
     total += source_leading + 1.0
     total += len(source_lines) * source_leading
@@ -133,8 +190,139 @@ def choose_sizes() -> tuple[float, float, float]:
     return options[-1]
 
 
-def draw_pdf(path: Path) -> None:
-    body_size, heading_size, source_size = choose_sizes()
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+BULLET_RE = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+(.*)$")
+TABLE_RULE_RE = re.compile(r"^\s*\|?\s*:?-{3,}")
+LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+
+
+def clean_inline(text: str) -> str:
+    text = LINK_RE.sub(r"\1", text)
+    text = text.replace("**", "").replace("__", "").replace("`", "")
+    # Built-in PDF fonts only cover WinAnsi; drop emoji and other glyphs they cannot draw.
+    text = text.encode("cp1252", "ignore").decode("cp1252")
+    return " ".join(text.split())
+
+
+def parse_markdown_doc(path: Path) -> tuple[str, list[tuple[str, list[str]]]]:
+    """Map a docs/ markdown file onto the one-pager heading/bullet model."""
+    title = path.stem.replace("_", " ")
+    seen_title = False
+    sections: list[tuple[str, list[str]]] = []
+    heading = "Overview"
+    items: list[str] = []
+    paragraph: list[str] = []
+    in_code = False
+
+    def flush_paragraph() -> None:
+        text = clean_inline(" ".join(paragraph))
+        if text:
+            items.append(text)
+        paragraph.clear()
+
+    for raw_line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+        line = raw_line.rstrip()
+        if line.lstrip().startswith("```"):
+            flush_paragraph()
+            in_code = not in_code
+            continue
+        if in_code:
+            code = clean_inline(line)
+            if code:
+                items.append(code)
+            continue
+
+        heading_match = HEADING_RE.match(line)
+        if heading_match:
+            flush_paragraph()
+            text = clean_inline(heading_match.group(2))
+            if len(heading_match.group(1)) == 1 and not seen_title:
+                title = text or title
+                seen_title = True
+                continue
+            if items:
+                sections.append((heading, items))
+            heading = text or heading
+            items = []
+            continue
+
+        if not line.strip() or TABLE_RULE_RE.match(line):
+            flush_paragraph()
+            continue
+
+        bullet_match = BULLET_RE.match(line)
+        if bullet_match:
+            flush_paragraph()
+            text = clean_inline(bullet_match.group(1))
+            if text:
+                items.append(text)
+            continue
+
+        if line.lstrip().startswith("|"):
+            flush_paragraph()
+            text = clean_inline(" | ".join(cell.strip() for cell in line.strip().strip("|").split("|")))
+            if text:
+                items.append(text)
+            continue
+
+        paragraph.append(line.strip())
+
+    flush_paragraph()
+    if items:
+        sections.append((heading, items))
+    return title, sections
+
+
+def layout_document(
+    title: str,
+    subtitle: str,
+    sections: list[tuple[str, list[str]]],
+    sources: list[str],
+    sizes: tuple[float, float, float],
+) -> DocLayout:
+    body_size, _, source_size = sizes
+    wrapped_sections = [
+        (heading, [wrapped_lines(f"- {item}", "Helvetica", body_size, TEXT_WIDTH) for item in items])
+        for heading, items in sections
+    ]
+    source_lines: list[str] = []
+    if sources:
+        source_text = "Sources: " + ", ".join(sources)
+        source_lines = wrapped_lines(source_text, "Helvetica", source_size, TEXT_WIDTH)
+    return DocLayout(title, subtitle, wrapped_sections, source_lines, sizes)
+
+
+class PageWriter:
+    """Top-down line writer that starts a new page instead of running off the bottom."""
+
+    def __init__(self, c: canvas.Canvas) -> None:
+        self.c = c
+        self.y = PAGE_HEIGHT - TOP_MARGIN
+        self._state: tuple[str, float, str] | None = None
+
+    def ensure_room(self, needed: float) -> None:
+        if self.y - needed < BOTTOM_MARGIN:
+            self.c.showPage()
+            self.y = PAGE_HEIGHT - TOP_MARGIN
+            self._state = None
+
+    def draw_line(self, text: str, font_name: str, font_size: float, color: str, advance: float) -> None:
+        self.ensure_room(font_size)
+        if self._state != (font_name, font_size, color):
+            self.c.setFillColor(HexColor(color))
+            self.c.setFont(font_name, font_size)
+            self._state = (font_name, font_size, color)
+        self.c.drawString(MARGIN_X, self.y, text)
+        self.y -= advance
+
+
+def draw_layout(c: canvas.Canvas, layout: DocLayout, outline_key: str | None = None) -> None:
+    """Draw one document onto `c`, flushing finished pages as it goes.
+
+    When `outline_key` is set, the document and each of its sections get PDF
+    outline entries under that key prefix.
+    """
+    body_size, heading_size, source_size = layout.sizes
 
     title_size = heading_size + 5.0
     subtitle_size = body_size - 0.6
@@ -143,60 +331,250 @@ def draw_pdf(path: Path) -> None:
     heading_leading = heading_size + 2.0
     source_leading = source_size + 2.0
 
-    c = canvas.Canvas(str(path), pagesize=letter)
-    y = PAGE_HEIGHT - TOP_MARGIN
+    writer = PageWriter(c)
+    if outline_key is not None:
+        c.bookmarkPage(outline_key)
+        c.addOutlineEntry(layout.title, outline_key, level=0)
 
-    c.setFillColor(HexColor("#111827"))
-    c.setFont("Helvetica-Bold", title_size)
-    c.drawString(MARGIN_X, y, TITLE)
-    y -= title_size + 6
-
-    c.setFillColor(HexColor("#4B5563"))
-    c.setFont("Helvetica", subtitle_size)
-    c.drawString(MARGIN_X, y, SUBTITLE)
-    y -= subtitle_size + 12
+    writer.draw_line(layout.title, "Helvetica-Bold", title_size, "#111827", title_size + 6)
+    writer.draw_line(layout.subtitle, "Helvetica", subtitle_size, "#4B5563", subtitle_size + 12)
 
     c.setStrokeColor(HexColor("#D1D5DB"))
     c.setLineWidth(0.8)
-    c.line(MARGIN_X, y, PAGE_WIDTH - MARGIN_X, y)
-    y -= 10
+    c.line(MARGIN_X, writer.y, PAGE_WIDTH - MARGIN_X, writer.y)
+    writer.y -= 10
+
+    for index, (heading, items) in enumerate(layout.sections):
+        writer.ensure_room(heading_leading + body_leading)
+        if outline_key is not None:
+            section_key = f"{outline_key}-s{index}"
+            c.bookmarkHorizontal(section_key, 0, writer.y + heading_size)
+            c.addOutlineEntry(heading, section_key, level=1)
+        writer.draw_line(heading, "Helvetica-Bold", heading_size, "#1F2937", heading_leading)
+
+        for lines in items:
+            for line in lines:
+                writer.draw_line(line, "Helvetica", body_size, "#111827", body_leading)
+            writer.y -= 1.8
 
-    for heading, items in SECTIONS:
-        c.setFillColor(HexColor("#1F2937"))
-        c.setFont("Helvetica-Bold", heading_size)
-        c.drawString(MARGIN_X, y, heading)
-        y -= heading_leading
+        writer.y -= 1.8
 
-        c.setFillColor(HexColor("#111827"))
-        c.setFont("Helvetica", body_size)
-        for item in items:
-            lines = wrapped_lines(f"- {item}", "Helvetica", body_size, TEXT_WIDTH)
-            for line in lines:
-                c.drawString(MARGIN_X, y, line)
-                y -= body_leading
-            y -= 1.8
+    if layout.source_lines:
+        writer.ensure_room(source_leading * 2)
+        writer.draw_line("Evidence files", "Helvetica-Bold", source_size, "#4B5563", source_leading)
+        for line in layout.source_lines:
+            writer.draw_line(line, "Helvetica", source_size, "#4B5563", source_leading)
 
-        y -= 1.8
 
-    c.setFillColor(HexColor("#4B5563"))
-    c.setFont("Helvetica-Bold", source_size)
-    c.drawString(MARGIN_X, y, "Evidence files")
-    y -= source_leading
+def cache_key(content: object, deterministic: bool) -> str:
+    """Hash rendered content plus layout parameters.
 
-    c.setFont("Helvetica", source_size)
-    source_text = "Sources: " + ", ".join(SOURCES)
-    for line in wrapped_lines(source_text, "Helvetica", source_size, TEXT_WIDTH):
-        c.drawString(MARGIN_X, y, line)
-        y -= source_leading
+    The generated-on date only participates in deterministic mode, where it is
+    part of the byte-stable output; otherwise a date change alone is a cache hit.
+    """
+    payload = {
+        "version": RENDER_VERSION,
+        "content": content,
+        "page": [PAGE_WIDTH, PAGE_HEIGHT, MARGIN_X, TOP_MARGIN, BOTTOM_MARGIN],
+        "deterministic": deterministic,
+        "generated_on": GENERATED_ON if deterministic else None,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
 
+
+def load_cache() -> dict[str, str]:
+    try:
+        return json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache: dict[str, str]) -> None:
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    CACHE_PATH.write_text(json.dumps(cache, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def is_fresh(cache: dict[str, str], output: Path, key: str) -> bool:
+    return output.exists() and cache.get(output.as_posix()) == key
+
+
+def new_canvas(path: Path | str, deterministic: bool) -> canvas.Canvas:
+    # invariant=1 pins ReportLab's creation date and document ID so identical
+    # input produces identical bytes.
+    return canvas.Canvas(str(path), pagesize=letter, pageCompression=1, invariant=int(deterministic))
+
+
+def draw_pdf(path: Path, deterministic: bool = False) -> None:
+    layout = layout_document(TITLE, SUBTITLE, SECTIONS, SOURCES, choose_sizes())
+    c = new_canvas(path, deterministic)
+    draw_layout(c, layout)
     c.save()
 
 
-def main() -> None:
+def layout_markdown_doc(source: str) -> DocLayout:
+    path = Path(source)
+    title, sections = parse_markdown_doc(path)
+    subtitle = f"{path.as_posix()} | Generated {GENERATED_ON}"
+    return layout_document(title, subtitle, sections, [path.as_posix()], DOC_SIZES)
+
+
+def render_markdown_doc(job: tuple[str, str, bool]) -> str:
+    source, output, deterministic = job
+    c = new_canvas(output, deterministic)
+    draw_layout(c, layout_markdown_doc(source), outline_key="doc")
+    c.save()
+    return output
+
+
+def doc_cache_key(path: Path, deterministic: bool) -> str:
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    return cache_key({"doc": path.as_posix(), "sha256": digest, "sizes": DOC_SIZES}, deterministic)
+
+
+def glob_root(pattern: str) -> Path:
+    """The literal directory prefix of `pattern`, before its first wildcard component."""
+    parts = []
+    for part in Path(pattern).parts[:-1]:
+        if any(char in part for char in "*?["):
+            break
+        parts.append(part)
+    return Path(*parts)
+
+
+def collect_docs(patterns: list[str]) -> dict[Path, Path]:
+    """Matched markdown files mapped to their path relative to the matching glob's root."""
+    selected: dict[Path, Path] = {}
+    for pattern in patterns:
+        root = glob_root(pattern)
+        for path in sorted(Path().glob(pattern)):
+            if path.is_file() and path.suffix == ".md":
+                selected.setdefault(path, path.relative_to(root))
+    return selected
+
+
+def build_one_pager(cache: dict[str, str], deterministic: bool, force: bool) -> None:
+    key = cache_key({"title": TITLE, "sections": SECTIONS, "sources": SOURCES}, deterministic)
+    if not force and is_fresh(cache, OUTPUT_PATH, key):
+        print(f"Up to date: {OUTPUT_PATH.resolve()}")
+        return
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    draw_pdf(OUTPUT_PATH)
+    draw_pdf(OUTPUT_PATH, deterministic)
+    cache[OUTPUT_PATH.as_posix()] = key
     print(str(OUTPUT_PATH.resolve()))
 
 
+def build_docs(
+    docs: dict[Path, Path],
+    output_dir: Path,
+    workers: int,
+    cache: dict[str, str],
+    deterministic: bool,
+    force: bool,
+) -> None:
+    outputs: dict[Path, Path] = {}
+    for path, relative in docs.items():
+        output = output_dir / relative.with_suffix(".pdf")
+        if output in outputs:
+            raise SystemExit(f"{path} and {outputs[output]} would both be written to {output}")
+        outputs[output] = path
+
+    jobs: list[tuple[str, str, bool]] = []
+    keys: dict[str, str] = {}
+    for output, path in outputs.items():
+        output.parent.mkdir(parents=True, exist_ok=True)
+        key = doc_cache_key(path, deterministic)
+        if not force and is_fresh(cache, output, key):
+            print(f"Up to date: {output.resolve()}")
+            continue
+        jobs.append((str(path), str(output), deterministic))
+        keys[output.as_posix()] = key
+
+    if not jobs:
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_font_metrics) as pool:
+        for output in pool.map(render_markdown_doc, jobs):
+            cache[Path(output).as_posix()] = keys[Path(output).as_posix()]
+            print(str(Path(output).resolve()))
+
+
+def build_combined(
+    docs: list[Path],
+    output_path: Path,
+    workers: int,
+    cache: dict[str, str],
+    deterministic: bool,
+    force: bool,
+) -> None:
+    key = cache_key([doc_cache_key(path, deterministic) for path in docs], deterministic)
+    if not force and is_fresh(cache, output_path, key):
+        print(f"Up to date: {output_path.resolve()}")
+        return
+
+    # Parsing and line wrapping run in the pool; pages are drawn here in doc
+    # order. ReportLab keeps every page's stream in the document and only
+    # compresses them in save(), so memory grows with the total page count.
+    # Use per-doc mode for very large doc sets.
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    c = new_canvas(output_path, deterministic)
+    c.setTitle("Notelayer docs")
+    c.showOutline()
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_font_metrics) as pool:
+        layouts = pool.map(layout_markdown_doc, [str(path) for path in docs], chunksize=4)
+        for index, layout in enumerate(layouts):
+            if index:
+                c.showPage()
+            draw_layout(c, layout, outline_key=f"doc{index}")
+    c.save()
+    cache[output_path.as_posix()] = key
+    print(str(output_path.resolve()))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Render the Notelayer one-pager or docs/ markdown as PDF.")
+    parser.add_argument(
+        "--docs",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Render markdown files matching GLOB (repeatable), e.g. 'docs/*_Plan.md'.",
+    )
+    parser.add_argument("--combined", action="store_true", help="Write one multi-page PDF with an outline.")
+    parser.add_argument(
+        "--output",
+        help="Output directory (per-doc, mirroring folders below each glob's root) or file (--combined).",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+    parser.add_argument("--force", action="store_true", help="Regenerate even when the cache key matches.")
+    parser.add_argument(
+        "--deterministic",
+        action="store_true",
+        help="Fixed creation date and document ID; pair with SOURCE_DATE_EPOCH for byte-stable output.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    cache = load_cache()
+
+    if not args.docs:
+        build_one_pager(cache, args.deterministic, args.force)
+    else:
+        docs = collect_docs(args.docs)
+        if not docs:
+            raise SystemExit(f"No markdown files matched: {', '.join(args.docs)}")
+
+        workers = max(1, args.workers)
+        if args.combined:
+            output = Path(args.output) if args.output else COMBINED_OUTPUT_PATH
+            build_combined(list(docs), output, workers, cache, args.deterministic, args.force)
+        else:
+            output = Path(args.output) if args.output else DOCS_OUTPUT_DIR
+            build_docs(docs, output, workers, cache, args.deterministic, args.force)
+
+    save_cache(cache)
+
+
 if __name__ == "__main__":
     main()